@@ -0,0 +1,188 @@
+import argparse
+import json
+import random
+import re
+import threading
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from urllib.parse import urlparse, parse_qs
+from benchmarks.synthetic_tables import make_page_titles
+
+MAX_CATEGORY_LIMIT = 500
+TITLE_PATTERN = re.compile(r"\[\[(.+?)\]\]")
+
+
+def make_printouts(idx):
+    """
+    Deterministic ask printouts for the idx-th title. Every 10th title has no TDP and
+    every 25th reports its process in µm, like real pages the scraper drops or warns about.
+    """
+    cores = 2 ** (idx % 6)
+    printouts = {
+        "first launched": [{"timestamp": str(1262304000 + idx * 86400)}],
+        "core count": [str(cores)],
+        "thread count": [str(cores * 2)],
+        "market segment": [["Desktop", "Mobile", "Server", "Embedded"][idx % 4]],
+        "process": [{"value": 0.014, "unit": "µm"}] if idx % 25 == 0 else [{"value": 14, "unit": "nm"}],
+        "die area": [{"value": 120.5, "unit": "mm²"}]
+    }
+    if idx % 10 != 0:
+        printouts["tdp"] = [{"value": 15.0 + idx % 100, "unit": "W"}]
+    return printouts
+
+
+class MockWikiChip:
+    """
+    Local stand-in for the MediaWiki API at API_URL. Supports the categorymembers
+    listing, ask queries and prop=info revision lookups used by processor_parser.
+
+    Args:
+        n_titles (int): Number of pages in "Category:all microprocessor models"
+        latency (float): Seconds added to every response
+        error_rate (float): Probability of answering with an HTTP 500 HTML page
+        api_error_rate (float): Probability of answering an ask query with an API-level error
+        bad_title_every (int): Every bad_title_every-th title makes any ask query containing it fail (0: none)
+        max_ask_titles (int): Ask queries with more titles fail as too complex (0: no limit)
+        seed (int): Random seed for the error injection
+    """
+
+    def __init__(self, n_titles=1000, latency=0.0, error_rate=0.0, api_error_rate=0.0, bad_title_every=0, max_ask_titles=0, seed=0, host="127.0.0.1", port=0):
+        self.titles = make_page_titles(n_titles)
+        self.title_index = {title: idx for idx, title in enumerate(self.titles)}
+        self.latency = latency
+        self.error_rate = error_rate
+        self.api_error_rate = api_error_rate
+        self.bad_title_every = bad_title_every
+        self.max_ask_titles = max_ask_titles
+        self.random = random.Random(seed)
+        self.random_lock = threading.Lock()
+        self.requests = 0
+        self.server = ThreadingHTTPServer((host, port), self._make_handler())
+        self.thread = None
+
+    @property
+    def url(self):
+        host, port = self.server.server_address[:2]
+        return f"http://{host}:{port}/w/api.php"
+
+    def start(self):
+        self.thread = threading.Thread(target=self.server.serve_forever, daemon=True)
+        self.thread.start()
+        return self
+
+    def stop(self):
+        self.server.shutdown()
+        self.server.server_close()
+
+    def _roll(self, rate):
+        with self.random_lock:
+            return self.random.random() < rate
+
+    def _count_request(self):
+        with self.random_lock:
+            self.requests += 1
+
+    def categorymembers(self, params):
+        limit = params.get("cmlimit", "10")
+        limit = MAX_CATEGORY_LIMIT if limit == "max" else min(int(limit), MAX_CATEGORY_LIMIT)
+        start = int(params.get("cmcontinue", "0"))
+        members = [{"ns": 0, "title": title} for title in self.titles[start:start + limit]]
+        resp = {"query": {"categorymembers": members}}
+        if start + limit < len(self.titles):
+            resp["continue"] = {"cmcontinue": str(start + limit), "continue": "-||"}
+        return resp
+
+    def ask(self, params):
+        too_complex = {"error": {"code": "smw-error", "info": "The query is too complex."}}
+        if self._roll(self.api_error_rate):
+            return too_complex
+        titles = TITLE_PATTERN.findall(params.get("query", ""))
+        if self.max_ask_titles and len(titles) > self.max_ask_titles:
+            return too_complex
+        results = {}
+        for title in titles:
+            idx = self.title_index.get(title)
+            if idx is None:
+                continue
+            if self.bad_title_every and idx % self.bad_title_every == self.bad_title_every - 1:
+                return {"error": {"code": "smw-error", "info": f"Invalid value in {title}."}}
+            results[title] = {
+                "printouts": make_printouts(idx),
+                "fulltext": title,
+                "fullurl": f"https://en.wikichip.org/wiki/{title}",
+                "displaytitle": title
+            }
+        return {"query": {"results": results}}
+
+    def info(self, params):
+        pages = {}
+        for title in params.get("titles", "").split("|"):
+            idx = self.title_index.get(title)
+            if idx is None:
+                pages[f"-{len(pages) + 1}"] = {"title": title, "missing": ""}
+                continue
+            pages[str(idx + 1)] = {
+                "pageid": idx + 1,
+                "title": title,
+                "lastrevid": 1000 + idx,
+                "touched": "2025-09-15T00:00:00Z",
+                "fullurl": f"https://en.wikichip.org/wiki/{title}"
+            }
+        return {"query": {"pages": pages}}
+
+    def _make_handler(self):
+        mock = self
+
+        class Handler(BaseHTTPRequestHandler):
+            def do_GET(self):
+                if mock.latency:
+                    time.sleep(mock.latency)
+                params = {key: values[0] for key, values in parse_qs(urlparse(self.path).query).items()}
+
+                mock._count_request()
+                if mock._roll(mock.error_rate):
+                    body = b"<html><body>502 Bad Gateway</body></html>"
+                    self.send_response(500)
+                    self.send_header("Content-Type", "text/html")
+                else:
+                    if params.get("action") == "ask":
+                        resp = mock.ask(params)
+                    elif params.get("list") == "categorymembers":
+                        resp = mock.categorymembers(params)
+                    elif params.get("prop") == "info":
+                        resp = mock.info(params)
+                    else:
+                        resp = {"error": {"code": "badparams", "info": "Unsupported request."}}
+                    body = json.dumps(resp).encode("utf-8")
+                    self.send_response(200)
+                    self.send_header("Content-Type", "application/json")
+
+                self.send_header("Content-Length", str(len(body)))
+                self.end_headers()
+                self.wfile.write(body)
+
+            def log_message(self, format, *args):
+                pass
+
+        return Handler
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Run a local mock of the WikiChip MediaWiki API.")
+    parser.add_argument("--titles", type=int, default=1000, help="Number of processor pages.")
+    parser.add_argument("--latency", type=float, default=0.0, help="Seconds added to every response.")
+    parser.add_argument("--error-rate", type=float, default=0.0, help="Probability of an HTTP 500 response.")
+    parser.add_argument("--api-error-rate", type=float, default=0.0, help="Probability of an API-level error for ask queries.")
+    parser.add_argument("--bad-title-every", type=int, default=0, help="Every n-th title makes the ask queries containing it fail.")
+    parser.add_argument("--max-ask-titles", type=int, default=0, help="Ask queries with more titles fail as too complex.")
+    parser.add_argument("--port", type=int, default=8780, help="Port to listen on.")
+    args = parser.parse_args()
+
+    mock = MockWikiChip(args.titles, args.latency, args.error_rate, args.api_error_rate, args.bad_title_every, args.max_ask_titles, port=args.port)
+    print(f"✅ Mock WikiChip API with {args.titles} titles on {mock.url}")
+    try:
+        mock.server.serve_forever()
+    except KeyboardInterrupt:
+        mock.server.server_close()
+
+    # Example usage: python -m benchmarks.mock_wikichip --titles 2500 --latency 0.2 --error-rate 0.02
@@ -0,0 +1,173 @@
+import argparse
+import json
+import os
+import platform
+import statistics
+import subprocess
+import sys
+import tempfile
+import time
+from datetime import datetime, timezone
+import pandas as pd
+from benchmarks.synthetic_tables import make_processor_table
+from benchmarks.mock_wikichip import MockWikiChip
+from scripts import analyze_proc_tables
+from src import processor_parser
+from src.config import BATCH_SIZE, CLI_STARTUP_BUDGET
+from src.manipulate_proc_tables import normalize_processor_column, add_default_rows, _normalized_name_cache
+from src.tdp_estimator import TDPEstimator
+
+
+def timed(benchmark, rows, func, *args, **kwargs):
+    """
+    Runs func once and returns its result record.
+    """
+    start = time.perf_counter()
+    func(*args, **kwargs)
+    seconds = time.perf_counter() - start
+    print(f"⏱️  {benchmark} ({rows} rows): {seconds:.3f}s")
+    return {"benchmark": benchmark, "rows": rows, "seconds": round(seconds, 4), "rows_per_second": round(rows / seconds, 1) if seconds else None}
+
+
+def benchmark_tables(n_rows, tmp_dir):
+    """
+    Times the table stages on two synthetic tables of n_rows rows that share part of their names.
+    """
+    results = []
+    df1 = make_processor_table(n_rows, seed=1)
+    df2 = make_processor_table(n_rows, seed=2)
+
+    # Cold normalization, then a second call answered from the name cache
+    _normalized_name_cache.clear()
+    results.append(timed("normalize_processor_column", n_rows, normalize_processor_column, df1["name"]))
+    results.append(timed("normalize_processor_column (cached)", n_rows, normalize_processor_column, df1["name"]))
+
+    results.append(timed("get_matching_processors", n_rows, analyze_proc_tables.get_matching_processors, df1, df2))
+    results.append(timed("get_unmatched_processors", n_rows, analyze_proc_tables.get_unmatched_processors, df1, df2))
+    results.append(timed("add_default_rows", n_rows, add_default_rows, df1))
+
+    # The first batch also builds the KD-tree of its partition and features
+    estimator = TDPEstimator(df1)
+    specs = df1[["cores", "threads"]].head(10_000).to_dict("records")
+    results.append(timed("TDPEstimator.estimate_many (cold)", len(specs), estimator.estimate_many, specs, "local"))
+    results.append(timed("TDPEstimator.estimate_many", len(specs), estimator.estimate_many, specs, "local"))
+
+    file1 = os.path.join(tmp_dir, "table1.csv")
+    file2 = os.path.join(tmp_dir, "table2.csv")
+    df1.to_csv(file1, index=False)
+    df2.to_csv(file2, index=False)
+    _normalized_name_cache.clear()
+    results.append(timed("analyze_proc_tables.run", n_rows, analyze_proc_tables.run, file1, file2, os.path.join(tmp_dir, "analysis")))
+    return results
+
+
+def benchmark_scrape(n_titles, latency, error_rate, api_error_rate, max_workers, rate_limit, bad_title_every=0, max_ask_titles=0):
+    """
+    Times title enumeration and the sequential and concurrent detail fetches against the mock API.
+    """
+    results = []
+    mock = MockWikiChip(n_titles, latency=latency, error_rate=error_rate, api_error_rate=api_error_rate,
+                        bad_title_every=bad_title_every, max_ask_titles=max_ask_titles).start()
+    api_url, delay_range = processor_parser.API_URL, processor_parser.DELAY_RANGE
+    processor_parser.API_URL = mock.url
+    # The fixed sleeps between batches would dominate the measurement
+    processor_parser.DELAY_RANGE = (0, 0)
+    processor_parser.set_response_cache(None)
+
+    def timed_requests(benchmark, func, *args, **kwargs):
+        before = mock.requests
+        result = timed(benchmark, n_titles, func, *args, **kwargs)
+        result.update({
+            "latency": latency, "error_rate": error_rate, "api_error_rate": api_error_rate,
+            "bad_title_every": bad_title_every, "max_ask_titles": max_ask_titles, "requests": mock.requests - before
+        })
+        return result
+
+    try:
+        titles = []
+        def get_titles():
+            titles.extend(processor_parser.get_all_page_titles())
+        results.append(timed_requests("get_all_page_titles", get_titles))
+        results.append(timed_requests("get_processor_data", processor_parser.get_processor_data, titles, BATCH_SIZE))
+        results.append(timed_requests(
+            f"get_processor_data_concurrent (workers={max_workers}, rate={rate_limit}/s)",
+            processor_parser.get_processor_data_concurrent, titles, BATCH_SIZE, max_workers=max_workers, rate=rate_limit
+        ))
+        results.append(timed_requests(
+            f"get_processor_data_concurrent adaptive batching (workers={max_workers}, rate={rate_limit}/s)",
+            processor_parser.get_processor_data_concurrent, titles, processor_parser.AdaptiveBatchSizer(), max_workers=max_workers, rate=rate_limit
+        ))
+        # Title paging and the concurrent fetch overlapped through the bounded title queue
+        results.append(timed_requests(
+            f"pipelined titles + details (workers={max_workers}, rate={rate_limit}/s)",
+            lambda: processor_parser.get_processor_data_concurrent(
+                processor_parser.iter_prefetched(processor_parser.iter_page_titles()), BATCH_SIZE, max_workers=max_workers, rate=rate_limit
+            )
+        ))
+    finally:
+        processor_parser.API_URL, processor_parser.DELAY_RANGE = api_url, delay_range
+        mock.stop()
+    return results
+
+
+def benchmark_cli_startup(budget, repeats=5):
+    """
+    Times "python -m scripts --help" in fresh interpreters and lists the heavy modules
+    that importing the CLI pulls in (there should be none).
+    """
+    root = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+    seconds = []
+    for _ in range(repeats):
+        start = time.perf_counter()
+        subprocess.run([sys.executable, "-m", "scripts", "--help"], cwd=root, check=True, stdout=subprocess.DEVNULL)
+        seconds.append(time.perf_counter() - start)
+    heavy_modules = subprocess.run(
+        [sys.executable, "-c", "import sys, scripts.cli; print(' '.join(m for m in ('pandas', 'numpy', 'requests', 'pyarrow') if m in sys.modules))"],
+        cwd=root, check=True, capture_output=True, text=True
+    ).stdout.split()
+
+    median = statistics.median(seconds)
+    within_budget = median <= budget and not heavy_modules
+    print(f"{'⏱️ ' if within_budget else '❌'} python -m scripts --help: {median:.3f}s (budget {budget:.3f}s, heavy imports: {heavy_modules or 'none'})")
+    return {"benchmark": "cli startup (python -m scripts --help)", "seconds": round(median, 4), "budget_seconds": budget,
+            "within_budget": within_budget, "heavy_modules": heavy_modules}
+
+
+def run(sizes, output_file, scrape_titles=0, latency=0.05, error_rate=0.0, api_error_rate=0.0, max_workers=8, rate_limit=50.0, bad_title_every=0, max_ask_titles=0, startup_budget=CLI_STARTUP_BUDGET):
+    results = [benchmark_cli_startup(startup_budget)]
+    with tempfile.TemporaryDirectory() as tmp_dir:
+        for n_rows in sizes:
+            results.extend(benchmark_tables(n_rows, tmp_dir))
+    if scrape_titles:
+        results.extend(benchmark_scrape(scrape_titles, latency, error_rate, api_error_rate, max_workers, rate_limit, bad_title_every, max_ask_titles))
+
+    report = {
+        "timestamp": datetime.now(timezone.utc).isoformat(),
+        "python": platform.python_version(),
+        "pandas": pd.__version__,
+        "machine": platform.machine(),
+        "results": results
+    }
+    with open(output_file, "w") as f:
+        json.dump(report, f, indent=2)
+    print(f"✅ Saved {len(results)} benchmark results to {output_file}")
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Benchmark the table stages on synthetic tables and the scraper against a mock API.")
+    parser.add_argument("--sizes", type=int, nargs="*", default=[10_000, 100_000, 1_000_000], help="Rows per synthetic table (up to 10,000,000).")
+    parser.add_argument("--scrape-titles", type=int, default=0, help="Number of titles served by the mock API; 0 skips the scrape benchmark.")
+    parser.add_argument("--latency", type=float, default=0.05, help="Seconds added to every mock API response.")
+    parser.add_argument("--error-rate", type=float, default=0.0, help="Probability of an HTTP 500 response from the mock API.")
+    parser.add_argument("--api-error-rate", type=float, default=0.0, help="Probability of an API-level error for ask queries.")
+    parser.add_argument("--bad-title-every", type=int, default=0, help="Every n-th mock title makes the ask queries containing it fail.")
+    parser.add_argument("--max-ask-titles", type=int, default=0, help="Mock ask queries with more titles fail as too complex.")
+    parser.add_argument("--max-workers", type=int, default=8, help="Workers for the concurrent fetch.")
+    parser.add_argument("--rate-limit", type=float, default=50.0, help="Requests per second for the concurrent fetch.")
+    parser.add_argument("--startup-budget", type=float, default=CLI_STARTUP_BUDGET, help="Maximum median seconds for \"python -m scripts --help\".")
+    parser.add_argument("--output", type=str, default="bench_results.json", help="Path to the JSON results file.")
+    args = parser.parse_args()
+
+    run(args.sizes, args.output, args.scrape_titles, args.latency, args.error_rate, args.api_error_rate, args.max_workers, args.rate_limit, args.bad_title_every, args.max_ask_titles, args.startup_budget)
+
+    # Example usage: python -m benchmarks.run_benchmarks --sizes 10000 100000 --scrape-titles 2000 --latency 0.1 --error-rate 0.01
@@ -0,0 +1,77 @@
+import numpy as np
+import pandas as pd
+
+# (vendor, family, model prefix, usage, min cores, max cores, TDP per core)
+FAMILIES = [
+    ("Intel", "Core™ i3", "i3-", "local", 2, 4, 12.0),
+    ("Intel", "Core™ i5", "i5-", "local", 4, 6, 11.0),
+    ("Intel", "Core™ i7", "i7-", "local", 4, 8, 10.0),
+    ("Intel", "Xeon® Gold", "", "compute cluster", 8, 32, 6.5),
+    ("Intel", "Atom®", "C", "embedded", 2, 8, 4.0),
+    ("AMD", "Ryzen™ 5", "", "local", 6, 8, 10.0),
+    ("AMD", "EPYC™", "", "compute cluster", 16, 96, 3.5),
+    ("AMD", "Ryzen™ Embedded", "V", "embedded", 2, 8, 5.0),
+    ("Ampere", "Altra", "Q", "cloud", 32, 128, 1.3)
+]
+SUFFIXES = np.array(["", "U", "H", "K", "T", "GE", "HX", "Y"], dtype=object)
+
+
+def make_processor_table(n_rows, seed=0, name_pool=None):
+    """
+    Generates a processor table shaped like data/CPU_TDP.csv
+    (product_id, name, time, source, intended usage, cores, threads, tdp (W)).
+
+    Names look like "Intel® Core™ i5-4821U Processor". Model numbers are drawn from
+    name_pool distinct models (default: n_rows // 2), so two tables generated with
+    different seeds share part of their names, and each table repeats some names.
+
+    Args:
+        n_rows (int): Number of rows
+        seed (int): Random seed
+        name_pool (int): Number of distinct models to draw from
+
+    Returns:
+        pd.DataFrame
+    """
+    rng = np.random.default_rng(seed)
+    name_pool = name_pool or max(1, n_rows // 2)
+
+    # Every model id maps to a fixed family, number and suffix, so names and specs agree across tables
+    model_ids = rng.integers(0, name_pool, n_rows)
+    family_idx = model_ids % len(FAMILIES)
+    numbers = (model_ids // len(FAMILIES)) % 100000 + 1000
+    suffixes = SUFFIXES[(model_ids // 7) % len(SUFFIXES)]
+
+    vendors = np.array([f[0] for f in FAMILIES], dtype=object)[family_idx]
+    families = np.array([f[1] for f in FAMILIES], dtype=object)[family_idx]
+    prefixes = np.array([f[2] for f in FAMILIES], dtype=object)[family_idx]
+    usages = np.array([f[3] for f in FAMILIES], dtype=object)[family_idx]
+    min_cores = np.array([f[4] for f in FAMILIES])[family_idx]
+    max_cores = np.array([f[5] for f in FAMILIES])[family_idx]
+    tdp_per_core = np.array([f[6] for f in FAMILIES])[family_idx]
+
+    cores = min_cores + model_ids % (max_cores - min_cores + 1)
+    threads = np.where(model_ids % 3 == 0, cores, cores * 2)
+    tdp = np.round(cores * tdp_per_core * (0.8 + (model_ids % 5) * 0.1), 1)
+
+    names = (
+        pd.Series(vendors) + "® " + pd.Series(families) + " " + pd.Series(prefixes)
+        + pd.Series(numbers).astype(str) + pd.Series(suffixes) + " Processor"
+    )
+    return pd.DataFrame({
+        "product_id": np.arange(n_rows) + 100000,
+        "name": names,
+        "time": "2025-06-12 13:43:36",
+        "source": "https://example.com/products/" + pd.Series(model_ids).astype(str),
+        "intended usage": usages,
+        "cores": cores,
+        "threads": threads,
+        "tdp (W)": tdp
+    })
+
+
+def make_page_titles(n_titles):
+    """
+    Generates WikiChip-like page titles, e.g. "intel/family_3/model-3".
+    """
+    return [f"{FAMILIES[i % len(FAMILIES)][0].lower()}/family_{i % 50}/model-{i}" for i in range(n_titles)]
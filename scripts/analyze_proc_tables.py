@@ -1,14 +1,19 @@
 import os
-import argparse
+import sys
+from concurrent.futures import ProcessPoolExecutor
+from itertools import combinations
 import pandas as pd
-from src.manipulate_proc_tables import normalize_processor_column
-from src.io_utils import load_csv_from_file, save_df_to_csv
+from src.manipulate_proc_tables import get_normalized_names
+from src.io_utils import load_table_from_file, save_df_to_csv, iter_table_chunks, append_df_to_csv
+from src.config import ANALYZE_CHUNK_SIZE
+from src.fuzzy_match import get_fuzzy_matches
 
 
 def get_matching_processors(df1, df2, name_col="name", tdp_col="tdp (W)", cores_col="cores", label1="wikichip", label2="external"):
     """
     Compares two processor tables by normalizing processor names
     and comparing TDP and Core counts. Only returns rows where names matched.
+    Tables that already have a "normalized_name" column are not normalized again.
 
     Args:
         df1 (pd.DataFrame): First table
@@ -26,8 +31,8 @@ def get_matching_processors(df1, df2, name_col="name", tdp_col="tdp (W)", cores_
     df1 = df1.copy()
     df2 = df2.copy()
 
-    df1["normalized_name"] = normalize_processor_column(df1[name_col])
-    df2["normalized_name"] = normalize_processor_column(df2[name_col])
+    df1["normalized_name"] = get_normalized_names(df1, name_col)
+    df2["normalized_name"] = get_normalized_names(df2, name_col)
 
     # Merge only on matched names
     merged = pd.merge(
@@ -58,8 +63,8 @@ def get_unmatched_processors(df1, df2, name_col="name"):
     """
     df1 = df1.copy()
     df2 = df2.copy()
-    df1["normalized_name"] = normalize_processor_column(df1[name_col])
-    df2["normalized_name"] = normalize_processor_column(df2[name_col])
+    df1["normalized_name"] = get_normalized_names(df1, name_col)
+    df2["normalized_name"] = get_normalized_names(df2, name_col)
 
     matched_names = set(df1["normalized_name"]).intersection(set(df2["normalized_name"]))
     unmatched_df1 = df1[~df1["normalized_name"].isin(matched_names)]
@@ -97,19 +102,23 @@ def find_duplicate_rows(df, subset=None, print_results=True):
     return duplicates
 
 
-def run(input_file1, input_file2, output_dir):
+def run(input_file1, input_file2, output_dir, fuzzy_threshold=0.7):
     # Ensure the output directory exists
     if not os.path.exists(output_dir):
         os.makedirs(output_dir)
         print(f"✅ Created output directory: {output_dir}")
 
-    df1 = load_csv_from_file(input_file1)
-    df2 = load_csv_from_file(input_file2)
+    df1 = load_table_from_file(input_file1)
+    df2 = load_table_from_file(input_file2)
 
     if df1 is None or df2 is None:
         print("❌ Missing one or both input files.")
         return
 
+    # Normalize once, all analyses below reuse the column
+    df1["normalized_name"] = get_normalized_names(df1)
+    df2["normalized_name"] = get_normalized_names(df2)
+
     # get matching processors
     matching_names = get_matching_processors(df1, df2)
     if matching_names.empty:
@@ -127,18 +136,227 @@ def run(input_file1, input_file2, output_dir):
 
     # Get unmatched processors
     unmatched_df1, unmatched_df2 = get_unmatched_processors(df1, df2)
-    unmatched_file1 = f"{output_dir}/unmatched_{input_file1.split('/')[-1]}"
-    unmatched_file2 = f"{output_dir}/unmatched_{input_file2.split('/')[-1]}"
+    unmatched_file1 = f"{output_dir}/unmatched_{os.path.splitext(os.path.basename(input_file1))[0]}.csv"
+    unmatched_file2 = f"{output_dir}/unmatched_{os.path.splitext(os.path.basename(input_file2))[0]}.csv"
     save_df_to_csv(unmatched_df1, unmatched_file1)
     save_df_to_csv(unmatched_df2, unmatched_file2)
 
-if __name__ == "__main__":
-    parser = argparse.ArgumentParser(description="Compare two processor tables.")
-    parser.add_argument("input_file1", type=str, help="Path to the first input CSV file.")
-    parser.add_argument("input_file2", type=str, help="Path to the second input CSV file.")
-    parser.add_argument("--output-dir", type=str, default="data/analysis_results", help="Directory to save the output files.")
-    args = parser.parse_args()
+    # Second pass: scored candidate matches among the leftovers
+    fuzzy_matches = get_fuzzy_matches(unmatched_df1, unmatched_df2, threshold=fuzzy_threshold)
+    fuzzy_file = f"{output_dir}/fuzzy_matching_processor_names.csv"
+    print(f"Found {len(fuzzy_matches)} fuzzy matches with score >= {fuzzy_threshold}. Saving to {fuzzy_file}")
+    save_df_to_csv(fuzzy_matches, fuzzy_file)
+
+
+def run_streaming(input_file1, input_file2, output_dir, fuzzy_threshold=0.7, chunk_size=ANALYZE_CHUNK_SIZE):
+    """
+    Out-of-core variant of run for external catalogs too large to load at once.
+    The smaller input file is loaded and indexed by normalized name, the larger one
+    is read in chunks of chunk_size rows. Matching, significant difference and
+    unmatched rows are appended to the output files of run chunk by chunk, so memory
+    is bounded by the smaller table and one chunk (plus the fuzzy candidates above
+    the threshold). Unmatched rows of the larger table keep its order. Matching and
+    difference rows come out chunk by chunk and, within a chunk, in the order of
+    input_file1, like in run.
+    """
+    for input_file in (input_file1, input_file2):
+        if not os.path.exists(input_file):
+            print(f"❌ File {input_file} not found.")
+            return
+
+    if not os.path.exists(output_dir):
+        os.makedirs(output_dir)
+        print(f"✅ Created output directory: {output_dir}")
+
+    # Table 1 keeps its "wikichip" columns whichever of the two is streamed
+    stream_first = os.path.getsize(input_file1) > os.path.getsize(input_file2)
+    small_file, large_file = (input_file2, input_file1) if stream_first else (input_file1, input_file2)
+    small_label = "external" if stream_first else "wikichip"
+
+    small = load_table_from_file(small_file)
+    small["normalized_name"] = get_normalized_names(small)
+    small_index = {}
+    for pos, name in enumerate(small["normalized_name"]):
+        small_index.setdefault(name, []).append(pos)
+
+    matching_file = f"{output_dir}/matching_processor_names.csv"
+    diff_file = f"{output_dir}/diff_cores_or_tdp.csv"
+    unmatched_small_file = f"{output_dir}/unmatched_{os.path.splitext(os.path.basename(small_file))[0]}.csv"
+    unmatched_large_file = f"{output_dir}/unmatched_{os.path.splitext(os.path.basename(large_file))[0]}.csv"
+    # Outputs are appended to chunk by chunk, so results of an earlier run must not remain
+    for output_file in (matching_file, diff_file, unmatched_large_file):
+        if os.path.exists(output_file):
+            os.remove(output_file)
+    matched_positions = set()
+    fuzzy_parts = []
+    counts = {"rows": 0, "matching": 0, "diffs": 0, "unmatched": 0}
+
+    for chunk in iter_table_chunks(large_file, chunk_size):
+        chunk["normalized_name"] = get_normalized_names(chunk)
+        is_matched = chunk["normalized_name"].isin(small_index.keys())
+        matched_chunk = chunk[is_matched]
+        positions = sorted({pos for name in set(matched_chunk["normalized_name"]) for pos in small_index[name]})
+        matched_positions.update(positions)
+        matched_small = small.iloc[positions]
+
+        if not matched_chunk.empty:
+            left, right = (matched_chunk, matched_small) if stream_first else (matched_small, matched_chunk)
+            matching = get_matching_processors(left, right)
+            diffs = filter_significant_diffs(matching)
+            append_df_to_csv(matching, matching_file, header=counts["matching"] == 0)
+            append_df_to_csv(diffs, diff_file, header=counts["matching"] == 0)
+            counts["matching"] += len(matching)
+            counts["diffs"] += len(diffs)
+
+        unmatched_chunk = chunk[~is_matched]
+        append_df_to_csv(unmatched_chunk, unmatched_large_file, header=counts["rows"] == 0)
+        counts["unmatched"] += len(unmatched_chunk)
+        counts["rows"] += len(chunk)
+
+        # Unmatched rows of the smaller table are only known at the end, so the
+        # candidates are scored against all of it and filtered afterwards
+        left, right = (unmatched_chunk, small) if stream_first else (small, unmatched_chunk)
+        fuzzy_parts.append(get_fuzzy_matches(left, right, threshold=fuzzy_threshold))
+        print(f"✅ Compared {counts['rows']} rows of {large_file}: {counts['matching']} matching, {counts['unmatched']} unmatched")
+
+    if counts["matching"]:
+        print(f"Found {counts['matching']} matching processor names. Saved to {matching_file}")
+        print(f"Found {counts['diffs']} processors with TDP or core count differences > 0.5. Saved to {diff_file}")
+    else:
+        print("✅ No matching processor names found.")
+
+    is_matched_small = pd.Series(False, index=small.index)
+    is_matched_small.iloc[sorted(matched_positions)] = True
+    save_df_to_csv(small[~is_matched_small], unmatched_small_file)
+
+    matched_names = set(small["normalized_name"][is_matched_small])
+    fuzzy_parts = [part for part in fuzzy_parts if not part.empty] or fuzzy_parts[:1]
+    fuzzy_matches = pd.concat(fuzzy_parts, ignore_index=True) if fuzzy_parts else pd.DataFrame()
+    if not fuzzy_matches.empty:
+        fuzzy_matches = fuzzy_matches[~fuzzy_matches[f"normalized_name_{small_label}"].isin(matched_names)]
+        fuzzy_matches = fuzzy_matches.sort_values(["normalized_name_wikichip", "score"], ascending=[True, False], kind="stable").reset_index(drop=True)
+    fuzzy_file = f"{output_dir}/fuzzy_matching_processor_names.csv"
+    print(f"Found {len(fuzzy_matches)} fuzzy matches with score >= {fuzzy_threshold}. Saving to {fuzzy_file}")
+    save_df_to_csv(fuzzy_matches, fuzzy_file)
+
+
+# Normalized tables of a batch run, set once per worker process by init_batch_worker
+batch_tables = {}
+
+
+def init_batch_worker(tables):
+    global batch_tables
+    batch_tables = tables
+
+
+def get_table_labels(input_files):
+    """
+    Labels every input file by its file name without extension, adding a counter to repeated names.
+    """
+    labels = []
+    for input_file in input_files:
+        stem = os.path.splitext(os.path.basename(input_file))[0]
+        label, counter = stem, 2
+        while label in labels:
+            label, counter = f"{stem}_{counter}", counter + 1
+        labels.append(label)
+    return labels
+
+
+def compare_table_pair(label1, label2, fuzzy_threshold=0.7):
+    """
+    Runs the match, significant difference, unmatched and fuzzy analyses for two
+    tables of batch_tables. Columns are suffixed with _1 and _2 so the results of
+    all pairs can be concatenated.
+
+    Returns:
+        dict: "summary" (counts) and the DataFrames "matching", "diffs", "unmatched" and "fuzzy"
+    """
+    df1, df2 = batch_tables[label1], batch_tables[label2]
+    matching = get_matching_processors(df1, df2, label1="1", label2="2")
+    diffs = filter_significant_diffs(matching, tdp_col1="tdp (W)_1", tdp_col2="tdp (W)_2", cores_col1="cores_1", cores_col2="cores_2")
+    unmatched_df1, unmatched_df2 = get_unmatched_processors(df1, df2)
+    fuzzy = get_fuzzy_matches(unmatched_df1, unmatched_df2, threshold=fuzzy_threshold, label1="1", label2="2")
 
-    run(args.input_file1, args.input_file2, args.output_dir)
+    unmatched = pd.concat([
+        pd.DataFrame({"table": label1, "compared_with": label2, "normalized_name": unmatched_df1["normalized_name"], "name": unmatched_df1["name"]}),
+        pd.DataFrame({"table": label2, "compared_with": label1, "normalized_name": unmatched_df2["normalized_name"], "name": unmatched_df2["name"]})
+    ], ignore_index=True)
+    results = {"matching": matching, "diffs": diffs, "unmatched": unmatched, "fuzzy": fuzzy}
+    for key in ("matching", "diffs", "fuzzy"):
+        results[key].insert(0, "table_2", label2)
+        results[key].insert(0, "table_1", label1)
+
+    results["summary"] = {
+        "table_1": label1,
+        "table_2": label2,
+        "matching": len(matching),
+        "significant_diffs": len(diffs),
+        "unmatched_1": len(unmatched_df1),
+        "unmatched_2": len(unmatched_df2),
+        "fuzzy_matches": len(fuzzy)
+    }
+    return results
+
+
+def run_batch(input_files, output_dir, fuzzy_threshold=0.7, max_workers=None):
+    """
+    Compares every pair of N processor tables. Each table is loaded and normalized
+    once, the pairs are analyzed in parallel in a process pool, and the results of
+    all pairs are written to one combined report:
+
+    batch_summary.csv, batch_matching.csv, batch_diffs.csv, batch_unmatched.csv and batch_fuzzy.csv
+    """
+    if len(input_files) < 2:
+        print("❌ Need at least two input files to compare.")
+        return
+
+    if not os.path.exists(output_dir):
+        os.makedirs(output_dir)
+        print(f"✅ Created output directory: {output_dir}")
+
+    tables = {}
+    for label, input_file in zip(get_table_labels(input_files), input_files):
+        df = load_table_from_file(input_file)
+        if df is None:
+            print(f"❌ Skipping missing input file {input_file}.")
+            continue
+        # Only the compared columns are sent to the worker processes
+        df = df.reindex(columns=["name", "tdp (W)", "cores"])
+        df["normalized_name"] = get_normalized_names(df)
+        tables[label] = df
+
+    pairs = list(combinations(tables, 2))
+    if not pairs:
+        print("❌ Need at least two input files to compare.")
+        return
+    args = ([label1 for label1, _ in pairs], [label2 for _, label2 in pairs], [fuzzy_threshold] * len(pairs))
+
+    if max_workers == 1 or len(pairs) == 1:
+        init_batch_worker(tables)
+        results = list(map(compare_table_pair, *args))
+    else:
+        # Every worker receives the tables once, not once per pair
+        with ProcessPoolExecutor(max_workers=max_workers, initializer=init_batch_worker, initargs=(tables,)) as executor:
+            results = list(executor.map(compare_table_pair, *args))
+
+    for result in results:
+        summary = result["summary"]
+        print(f"{summary['table_1']} vs {summary['table_2']}: {summary['matching']} matching, {summary['significant_diffs']} with significant differences, "
+              f"{summary['unmatched_1']}/{summary['unmatched_2']} unmatched, {summary['fuzzy_matches']} fuzzy matches")
+
+    save_df_to_csv(pd.DataFrame([result["summary"] for result in results]), f"{output_dir}/batch_summary.csv")
+    for key in ("matching", "diffs", "unmatched", "fuzzy"):
+        frames = [result[key] for result in results]
+        # Empty frames only contribute their columns
+        frames = [frame for frame in frames if not frame.empty] or frames[:1]
+        save_df_to_csv(pd.concat(frames, ignore_index=True), f"{output_dir}/batch_{key}.csv")
+
+
+if __name__ == "__main__":
+    from scripts.cli import main as cli_main
+    cli_main(["analyze", *sys.argv[1:]])
 
-    # Example usage: python -m scripts.analyze_proc_tables data/CPU_TDP_wikichip.csv data/CPU_TDP.csv --output-dir data/analysis_results
\ No newline at end of file
+    # Example usage: python -m scripts.analyze_proc_tables data/CPU_TDP_wikichip.csv data/CPU_TDP.csv --output-dir data/analysis_results
+    # Streaming usage: python -m scripts.analyze_proc_tables data/CPU_TDP_wikichip.csv data/large_catalog.csv --streaming --chunk-size 100000
+    # Batch usage: python -m scripts.analyze_proc_tables data/CPU_TDP_wikichip.csv data/CPU_TDP.csv data/ampere_processors.csv --output-dir data/analysis_results/batch
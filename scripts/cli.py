@@ -0,0 +1,169 @@
+import argparse
+import contextlib
+import json
+import sys
+from src.config import ANALYZE_CHUNK_SIZE, BATCH_SIZE, ESTIMATOR_NEIGHBOURS, MAX_CONCURRENCY, RATE_LIMIT, CACHE_DIR, CACHE_TTL, LOOKUP_HOST, LOOKUP_PORT
+
+# Single entry point for all scripts: python -m scripts <command> ...
+# Only argparse and src.config are imported up front. pandas, requests and the
+# modules of each command are imported inside the handler that needs them, so
+# --help and quick commands start fast (see CLI_STARTUP_BUDGET in src/config.py).
+
+
+def positive_float(value):
+    number = float(value)
+    if not number > 0:
+        raise argparse.ArgumentTypeError(f"must be positive, got {value}")
+    return number
+
+
+def run_scrape(args):
+    from src.telemetry import configure_logging
+    from scripts.scrape_processors import main as scrape
+
+    configure_logging(args.log_format, args.log_level.upper())
+    scrape(args.input_titles, args.cpu_tdp_csv, args.external_csv, concurrent=args.concurrent, max_workers=args.max_workers,
+           rate_limit=args.rate_limit, previous_csv=args.previous_csv, resume=args.resume,
+           cache_dir=None if args.no_cache else args.cache_dir, cache_ttl=args.cache_ttl, snapshot=args.snapshot,
+           metrics_json=args.metrics_json, metrics_prom=args.metrics_prom, adaptive_batching=args.adaptive_batching)
+
+
+def run_analyze(args):
+    from scripts.analyze_proc_tables import run, run_batch, run_streaming
+
+    if args.streaming and len(args.input_files) == 2 and not args.batch:
+        run_streaming(args.input_files[0], args.input_files[1], args.output_dir, fuzzy_threshold=args.fuzzy_threshold, chunk_size=args.chunk_size)
+    elif args.batch or len(args.input_files) != 2:
+        run_batch(args.input_files, args.output_dir, fuzzy_threshold=args.fuzzy_threshold, max_workers=args.max_workers)
+    else:
+        run(args.input_files[0], args.input_files[1], args.output_dir, fuzzy_threshold=args.fuzzy_threshold)
+
+
+def run_lookup(args):
+    if args.compiled_lookup:
+        from src.compiled_lookup import CompiledTDPLookup
+
+        tdp_lookup = CompiledTDPLookup(args.compiled_lookup)
+    else:
+        from src.tdp_lookup import TDPLookup
+
+        # stdout only carries the JSON results
+        with contextlib.redirect_stdout(sys.stderr):
+            tdp_lookup = TDPLookup.from_csv(args.cpu_tdp_csv)
+        if tdp_lookup is None:
+            sys.exit(1)
+    for result in tdp_lookup.lookup_many(args.names, args.usage):
+        print(json.dumps(result, default=str))
+
+
+def run_estimate(args):
+    from src.tdp_estimator import TDPEstimator
+
+    with contextlib.redirect_stdout(sys.stderr):
+        estimator = TDPEstimator.from_csv(args.cpu_tdp_csv, k=args.neighbours)
+    if estimator is None:
+        sys.exit(1)
+    spec = {"cores": args.cores, "threads": args.threads, "process": args.process, "die area": args.die_area}
+    print(json.dumps(estimator.estimate(spec, args.usage), default=str))
+
+
+def run_diff(args):
+    from scripts.diff_snapshots import run
+
+    run(args.snapshots, args.output_dir)
+
+
+def run_serve(args):
+    from scripts.serve_tdp_lookup import serve
+
+    serve(args.cpu_tdp_csv, args.host, args.port)
+
+
+def add_scrape_arguments(parser):
+    parser.add_argument("--input-titles", type=str, default="data/page_titles.json", help="Path to the input JSON file for page titles.")
+    parser.add_argument("--cpu-tdp-csv", type=str, default="data/CPU_TDP_wikichip.csv", help="Path to the CSV file for processor data (if existing already).")
+    parser.add_argument("--external-csv", type=str, nargs="+", default=["data/external_processors.csv"], help="Paths to external processor CSV files, merged after the WikiChip data in the given order of priority.")
+    parser.add_argument("--concurrent", action="store_true", help="Fetch processor details with several workers sharing a rate limit instead of sleeping after each batch.")
+    parser.add_argument("--max-workers", type=int, default=MAX_CONCURRENCY, help="Maximum number of batches fetched at once in concurrent mode.")
+    parser.add_argument("--rate-limit", type=positive_float, default=RATE_LIMIT, help="Maximum API requests per second in concurrent mode.")
+    parser.add_argument("--adaptive-batching", action="store_true", help=f"Start with batches of {BATCH_SIZE} titles, grow them while responses are fast and clean, and shrink them on errors or slow responses.")
+    parser.add_argument("--previous-csv", type=str, default=None, help="Path to a previous snapshot CSV. Only titles that are new or changed since then are fetched again.")
+    parser.add_argument("--resume", action="store_true", help="Continue an interrupted scrape from its checkpoint file instead of starting over.")
+    parser.add_argument("--cache-dir", type=str, default=CACHE_DIR, help="Directory of the on-disk API response cache.")
+    parser.add_argument("--cache-ttl", type=float, default=CACHE_TTL, help="Time in seconds after which cached API responses are fetched again.")
+    parser.add_argument("--no-cache", action="store_true", help="Always send requests to the API, without reading or writing the response cache.")
+    parser.add_argument("--snapshot", action="store_true", help="Also save the final table as a typed Parquet snapshot next to the CSV file.")
+    parser.add_argument("--log-format", choices=["text", "json"], default="text", help="Print progress as plain messages or as JSON lines.")
+    parser.add_argument("--log-level", choices=["debug", "info", "warning", "error"], default="info", help="Lowest level of the progress messages to print; debug adds one event per API request.")
+    parser.add_argument("--metrics-json", type=str, default=None, help="Path to write the scrape telemetry summary as JSON.")
+    parser.add_argument("--metrics-prom", type=str, default=None, help="Path to write the scrape telemetry summary in the Prometheus text format.")
+
+
+def add_analyze_arguments(parser):
+    parser.add_argument("input_files", type=str, nargs="+", help="Paths to the input CSV files or Parquet snapshots.")
+    parser.add_argument("--output-dir", type=str, default="data/analysis_results", help="Directory to save the output files.")
+    parser.add_argument("--fuzzy-threshold", type=float, default=0.7, help="Minimum score (0-1) for fuzzy matches between unmatched processors.")
+    parser.add_argument("--batch", action="store_true", help="Compare every pair of input files and write one combined report (implied by more than two files).")
+    parser.add_argument("--max-workers", type=int, default=None, help="Worker processes for batch mode (default: number of CPUs).")
+    parser.add_argument("--streaming", action="store_true", help="Compare two tables out of core: index the smaller file and read the larger one in chunks.")
+    parser.add_argument("--chunk-size", type=int, default=ANALYZE_CHUNK_SIZE, help="Rows of the larger table per chunk in streaming mode.")
+
+
+def add_lookup_arguments(parser):
+    parser.add_argument("names", type=str, nargs="+", help="Processor names to look up, e.g. \"Intel® Xeon® Gold 6148\".")
+    parser.add_argument("--cpu-tdp-csv", type=str, default="data/CPU_TDP_wikichip.csv", help="Path to the processor CSV file produced by scrape.")
+    parser.add_argument("--compiled-lookup", type=str, default=None, help="Path to a compiled lookup file written by scrape (e.g. data/CPU_TDP_wikichip.lookup.bin), used instead of the CSV file.")
+    parser.add_argument("--usage", type=str, default=None, help="Usage category (local, compute cluster, cloud or embedded) for the default row of unknown processors.")
+
+
+def add_estimate_arguments(parser):
+    parser.add_argument("--cores", type=int, required=True, help="Core count of the processor.")
+    parser.add_argument("--threads", type=int, default=None, help="Thread count of the processor.")
+    parser.add_argument("--process", type=float, default=None, help="Process node in nm.")
+    parser.add_argument("--die-area", type=float, default=None, help="Die area in mm².")
+    parser.add_argument("--usage", type=str, default=None, help="Usage category (local, compute cluster, cloud or embedded) whose processors are searched.")
+    parser.add_argument("--neighbours", type=int, default=ESTIMATOR_NEIGHBOURS, help="Number of similar processors the estimate is based on.")
+    parser.add_argument("--cpu-tdp-csv", type=str, default="data/CPU_TDP_wikichip.csv", help="Path to the processor CSV file produced by scrape.")
+
+
+def add_diff_arguments(parser):
+    parser.add_argument("snapshots", type=str, nargs="+", help="Snapshot CSV or Parquet files, oldest first.")
+    parser.add_argument("--output-dir", type=str, default="data/changelog", help="Directory to save the changelogs.")
+
+
+def add_serve_arguments(parser):
+    parser.add_argument("cpu_tdp_csv", type=str, help="Path to the processor CSV file produced by scrape.")
+    parser.add_argument("--host", type=str, default=LOOKUP_HOST, help="Host to bind to.")
+    parser.add_argument("--port", type=int, default=LOOKUP_PORT, help="Port to listen on.")
+
+
+# command -> (help, argument setup, handler)
+COMMANDS = {
+    "scrape": ("Fetch processor data from WikiChip and save it to a CSV file.", add_scrape_arguments, run_scrape),
+    "analyze": ("Compare two or more processor tables.", add_analyze_arguments, run_analyze),
+    "lookup": ("Look up the TDP of processors, printing one JSON result per name.", add_lookup_arguments, run_lookup),
+    "estimate": ("Estimate the TDP of a processor missing from the table from the most similar processors.", add_estimate_arguments, run_estimate),
+    "diff": ("Show what changed between dated processor table snapshots.", add_diff_arguments, run_diff),
+    "serve": ("Serve CPU model -> TDP lookups over HTTP.", add_serve_arguments, run_serve)
+}
+
+
+def build_parser():
+    parser = argparse.ArgumentParser(prog="python -m scripts", description="WikiChip processor data tools.")
+    subparsers = parser.add_subparsers(dest="command", required=True, metavar="command")
+    for command, (help_text, add_arguments, handler) in COMMANDS.items():
+        subparser = subparsers.add_parser(command, help=help_text, description=help_text)
+        add_arguments(subparser)
+        subparser.set_defaults(handler=handler)
+    return parser
+
+
+def main(argv=None):
+    args = build_parser().parse_args(argv)
+    args.handler(args)
+
+
+if __name__ == "__main__":
+    main()
+
+    # Example usage: python -m scripts lookup "Intel Xeon Gold 6148" --usage "compute cluster" --cpu-tdp-csv data/CPU_TDP_wikichip_2025-09-15.csv
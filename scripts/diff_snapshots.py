@@ -0,0 +1,49 @@
+import os
+import sys
+import pandas as pd
+from src.io_utils import load_table_from_file, save_df_to_csv
+from src.snapshot_diff import diff_snapshots, summarize_changelog
+
+
+def run(snapshots, output_dir):
+    """
+    Diffs every snapshot against the one before it and writes one changelog per pair
+    plus a summary with the counts of all pairs.
+    """
+    if len(snapshots) < 2:
+        print("❌ Need at least two snapshots to compare.")
+        return
+
+    if not os.path.exists(output_dir):
+        os.makedirs(output_dir)
+        print(f"✅ Created output directory: {output_dir}")
+
+    summaries = []
+    previous_file, previous_df = snapshots[0], load_table_from_file(snapshots[0])
+    for current_file in snapshots[1:]:
+        current_df = load_table_from_file(current_file)
+        if previous_df is None or current_df is None:
+            print(f"❌ Skipping {previous_file} -> {current_file}, missing input file.")
+        else:
+            changelog = diff_snapshots(previous_df, current_df)
+            old_name = os.path.splitext(os.path.basename(previous_file))[0]
+            new_name = os.path.splitext(os.path.basename(current_file))[0]
+            save_df_to_csv(changelog, f"{output_dir}/changelog_{old_name}_to_{new_name}.csv")
+
+            summary = summarize_changelog(changelog)
+            print(f"{old_name} -> {new_name}: {summary['added']} added, {summary['removed']} removed, {summary['changed']} changed")
+            summaries.append({"old": previous_file, "new": current_file, **summary})
+        previous_file, previous_df = current_file, current_df
+
+    if summaries:
+        summary_df = pd.DataFrame(summaries)
+        count_cols = summary_df.columns.drop(["old", "new"])
+        summary_df[count_cols] = summary_df[count_cols].fillna(0).astype(int)
+        save_df_to_csv(summary_df, f"{output_dir}/changelog_summary.csv")
+
+
+if __name__ == "__main__":
+    from scripts.cli import main as cli_main
+    cli_main(["diff", *sys.argv[1:]])
+
+    # Example usage: python -m scripts.diff_snapshots data_old/CPU_TDP_wikichip_2025-06-30.csv data/CPU_TDP_wikichip_2025-09-15.csv --output-dir data/changelog
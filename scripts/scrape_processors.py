@@ -1,51 +1,167 @@
-import argparse
-from src.processor_parser import get_all_page_titles, get_processor_data
-from src.io_utils import save_json_to_file, load_json_from_file, save_df_to_csv, load_csv_from_file
-from src.config import BATCH_SIZE
-from src.manipulate_proc_tables import add_default_rows, print_market_segment_counts, append_matching_columns, normalize_processor_column, drop_duplicate_names
-import pandas as pd
+import os
+import sys
+from src.processor_parser import AdaptiveBatchSizer, get_all_page_titles, iter_page_titles, iter_prefetched, get_processor_data, get_processor_data_concurrent, get_page_revisions, get_changed_titles, set_response_cache
+from src.response_cache import ResponseCache
+from src.telemetry import telemetry
+from src.compiled_lookup import save_compiled_lookup, get_compiled_lookup_path
+from src.io_utils import save_json_to_file, load_json_from_file, save_df_to_csv, load_csv_from_file, load_checkpoint_df, load_checkpoint_titles, save_df_to_parquet, get_snapshot_path
+from src.config import BATCH_SIZE, MAX_CONCURRENCY, RATE_LIMIT, PROCESSOR_COLUMNS, CACHE_DIR, CACHE_TTL, MERGE_RULES, WIKICHIP_URL
+from src.manipulate_proc_tables import add_default_rows, print_market_segment_counts, merge_sources, drop_default_rows
 
 
-def main(input_titles, cpu_tdp_csv, external_csv):
+def get_revisions_path(cpu_tdp_csv):
+    """
+    Returns the path of the revision file stored next to a snapshot CSV,
+    e.g. data/CPU_TDP_wikichip_2025-09-15.revisions.json
+    """
+    return f"{os.path.splitext(cpu_tdp_csv)[0]}.revisions.json"
+
+
+def get_field_sources_path(cpu_tdp_csv):
+    """
+    Returns the path of the file naming the source of every field of a snapshot CSV,
+    e.g. data/CPU_TDP_wikichip_2025-09-15.sources.csv
+    """
+    return f"{os.path.splitext(cpu_tdp_csv)[0]}.sources.csv"
+
+
+def get_checkpoint_path(cpu_tdp_csv):
+    """
+    Returns the path of the batch checkpoint file used while scraping a snapshot,
+    e.g. data/CPU_TDP_wikichip_2025-09-15.checkpoint.jsonl
+    """
+    return f"{os.path.splitext(cpu_tdp_csv)[0]}.checkpoint.jsonl"
+
+
+def stream_page_titles(titles):
+    """
+    Yields the category's page titles while they are listed in a background thread,
+    collecting them in titles.
+    """
+    for title in iter_prefetched(iter_page_titles()):
+        titles.append(title)
+        yield title
+
+
+def fetch_processors_df(titles, checkpoint_file, resume=False, concurrent=False, max_workers=MAX_CONCURRENCY, rate_limit=RATE_LIMIT, adaptive_batching=False):
+    batch_size = AdaptiveBatchSizer() if adaptive_batching else BATCH_SIZE
+    # Batches are streamed to the checkpoint file, the table is built from it afterwards
+    if concurrent:
+        get_processor_data_concurrent(titles, batch_size=batch_size, max_workers=max_workers, rate=rate_limit, checkpoint_file=checkpoint_file, resume=resume)
+    else:
+        get_processor_data(titles, batch_size=batch_size, checkpoint_file=checkpoint_file, resume=resume)
+    return load_checkpoint_df(checkpoint_file, columns=PROCESSOR_COLUMNS)
+
+
+def main(input_titles, cpu_tdp_csv, external_csv, concurrent=False, max_workers=MAX_CONCURRENCY, rate_limit=RATE_LIMIT, previous_csv=None, resume=False, cache_dir=CACHE_DIR, cache_ttl=CACHE_TTL, snapshot=False, metrics_json=None, metrics_prom=None, adaptive_batching=False):
+    telemetry.reset()
+    cache = ResponseCache(cache_dir, ttl=cache_ttl) if cache_dir else None
+    set_response_cache(cache)
+
     titles = load_json_from_file(input_titles)
-    if not titles:
-        print("Fetching processor titles...")
-        titles = get_all_page_titles()
+    processors_df = load_csv_from_file(cpu_tdp_csv)
+    scrape = processors_df is None or processors_df.empty
+    previous_df = load_csv_from_file(previous_csv) if scrape and previous_csv else None
+    # A full scrape without a saved title list fetches details while the titles are still being listed
+    pipelined = scrape and not titles and previous_df is None
+    # Incremental runs must see new and edited pages; full runs list titles and revisions from the cache
+    fresh = previous_df is not None
+
+    if not titles and not pipelined:
+        with telemetry.stage("Fetching processor titles"):
+            titles = get_all_page_titles(use_cache=not fresh)
         save_json_to_file(titles, input_titles)
 
-    processors_df = load_csv_from_file(cpu_tdp_csv)
-    if processors_df is None or processors_df.empty:
-        print("Fetching processor details...")
-        processors = get_processor_data(titles, batch_size=BATCH_SIZE)
-        # Create DataFrame from the list of tuples
-        processors_df = pd.DataFrame(processors, columns=["name", "launch date", "source", "intended usage", "tdp (W)", "cores", "threads", "process", "die area"])
-    
-        # Load external processors data to append
-        ext_df = load_csv_from_file(external_csv)
-        processors_df = append_matching_columns(processors_df, ext_df)
+    if scrape:
+        checkpoint_file = get_checkpoint_path(cpu_tdp_csv)
 
-        # Normalize the "name" column 
-        processors_df["name"] = normalize_processor_column(processors_df["name"])
-    
-        #print_market_segment_counts(processors_df, col="intended usage")
+        if pipelined:
+            titles = []
+            with telemetry.stage("Fetching processor titles and details"):
+                processors_df = fetch_processors_df(stream_page_titles(titles), checkpoint_file, resume, concurrent, max_workers, rate_limit, adaptive_batching)
+            print(f"✅ Total titles retrieved: {len(titles)}")
+            save_json_to_file(titles, input_titles)
+
+        # A rerun of the same snapshot (e.g. after deleting its CSV) only probes titles without a saved revision
+        saved_revisions = {} if fresh or not os.path.exists(get_revisions_path(cpu_tdp_csv)) else load_json_from_file(get_revisions_path(cpu_tdp_csv))
+        revisions = {title: saved_revisions[title] for title in titles if title in saved_revisions}
+        missing_titles = [title for title in titles if title not in revisions]
+        if missing_titles:
+            with telemetry.stage("Fetching page revisions"):
+                revisions.update(get_page_revisions(missing_titles, use_cache=not fresh))
+
+        if previous_df is not None:
+            # Incremental mode: only fetch titles that are new or changed since the previous snapshot
+            previous_revisions = load_json_from_file(get_revisions_path(previous_csv)) or {}
+            changed, removed = get_changed_titles(titles, previous_revisions, revisions)
+            print(f"Found {len(changed)} new or changed titles and {len(removed)} removed titles.")
+
+            # Rows are linked to their page through the source URL
+            stale_urls = set()
+            for title in changed + removed:
+                for title_revisions in (previous_revisions.get(title), revisions.get(title)):
+                    if title_revisions and title_revisions.get("fullurl"):
+                        stale_urls.add(title_revisions["fullurl"])
+            previous_df = drop_default_rows(previous_df)
+            # Rows of the external tables are merged in again from the current external CSVs
+            previous_df = previous_df[previous_df["source"].str.startswith(WIKICHIP_URL, na=False)]
+            previous_df = previous_df[~previous_df["source"].isin(stale_urls)]
+
+            with telemetry.stage("Fetching processor details"):
+                processors_df = fetch_processors_df(changed, checkpoint_file, resume, concurrent, max_workers, rate_limit, adaptive_batching)
+        elif not pipelined:
+            with telemetry.stage("Fetching processor details"):
+                processors_df = fetch_processors_df(titles, checkpoint_file, resume, concurrent, max_workers, rate_limit, adaptive_batching)
 
-        # Find and print duplicate rows
-        processors_df = drop_duplicate_names(processors_df)
+        # Titles that could not be fetched keep no revision, so the next incremental run fetches them again
+        requested = changed if previous_df is not None else titles
+        failed = set(requested) - load_checkpoint_titles(checkpoint_file)
+        if failed:
+            print(f"⚠️ {len(failed)} titles could not be fetched and are left out of the revisions.")
+            revisions = {title: revision for title, revision in revisions.items() if title not in failed}
 
-        # Add default rows 
-        processors_df = add_default_rows(processors_df)
+        with telemetry.stage("Merging and normalizing"):
+            # Highest priority first: fresh rows, the previous snapshot, then the external tables in the given order
+            sources = [("wikichip", processors_df)]
+            if previous_df is not None:
+                sources.append(("previous", previous_df))
+            for external in ([external_csv] if isinstance(external_csv, str) else external_csv):
+                sources.append((os.path.splitext(os.path.basename(external))[0], load_csv_from_file(external)))
+            processors_df, field_sources = merge_sources(sources, rules=MERGE_RULES)
+
+            #print_market_segment_counts(processors_df, col="intended usage")
+
+        with telemetry.stage("Adding default rows"):
+            processors_df = add_default_rows(processors_df)
     
-        # Save the DataFrame to CSV
-        save_df_to_csv(processors_df, cpu_tdp_csv)
+        with telemetry.stage("Saving"):
+            # Save the DataFrame to CSV
+            save_df_to_csv(processors_df, cpu_tdp_csv)
+            if snapshot:
+                save_df_to_parquet(processors_df, get_snapshot_path(cpu_tdp_csv))
+            save_json_to_file(revisions, get_revisions_path(cpu_tdp_csv))
+            save_df_to_csv(field_sources, get_field_sources_path(cpu_tdp_csv))
+            # Memory-mapped lookup file for consumers that should not parse the CSV
+            save_compiled_lookup(processors_df.to_dict("records"), get_compiled_lookup_path(cpu_tdp_csv))
 
+        # The snapshot is complete, the checkpoint is no longer needed
+        if os.path.exists(checkpoint_file):
+            os.remove(checkpoint_file)
 
-if __name__ == "__main__":
-    parser = argparse.ArgumentParser(description="Process and save processor data.")
-    parser.add_argument("--input-titles", type=str, default="data/page_titles.json", help="Path to the input JSON file for page titles.")
-    parser.add_argument("--cpu-tdp-csv", type=str, default="data/CPU_TDP_wikichip.csv", help="Path to the CSV file for processor data (if existing already).")
-    parser.add_argument("--external-csv", type=str, default="data/external_processors.csv", help="Path to the external processors CSV file.")
-    args = parser.parse_args()
+    if cache:
+        stats = cache.stats()
+        telemetry.record_cache(stats)
+        print(f"✅ Response cache: {stats['hits']} hits, {stats['misses']} misses, {stats['evictions']} evictions")
 
-    main(args.input_titles, args.cpu_tdp_csv, args.external_csv)
+    telemetry.log_summary()
+    if metrics_json:
+        telemetry.write_json(metrics_json)
+    if metrics_prom:
+        telemetry.write_prometheus(metrics_prom)
+
+
+if __name__ == "__main__":
+    from scripts.cli import main as cli_main
+    cli_main(["scrape", *sys.argv[1:]])
 
-    # Example usage: python -m scripts.scrape_processors --input-titles data/page_titles_2025-09-15.json --cpu-tdp-csv data/CPU_TDP_wikichip_2025-09-15.csv --external-csv data/ampere_processors_2025-09-15.csv
\ No newline at end of file
+    # Example usage: python -m scripts.scrape_processors --input-titles data/page_titles_2025-09-15.json --cpu-tdp-csv data/CPU_TDP_wikichip_2025-09-15.csv --external-csv data/ampere_processors_2025-09-15.csv
@@ -0,0 +1,85 @@
+import json
+import sys
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from urllib.parse import urlparse, parse_qs
+from src.config import LOOKUP_HOST, LOOKUP_PORT
+from src.tdp_lookup import TDPLookup
+
+
+def make_handler(tdp_lookup):
+    class LookupHandler(BaseHTTPRequestHandler):
+        """
+        GET  /lookup?name=<cpu model>&usage=<category>  -> one result
+        POST /lookup  {"names": [...], "usage": "<category>"}  -> list of results
+        GET  /health  -> lookup cache statistics
+        """
+
+        def send_json(self, status, payload):
+            body = json.dumps(payload).encode("utf-8")
+            self.send_response(status)
+            self.send_header("Content-Type", "application/json")
+            self.send_header("Content-Length", str(len(body)))
+            self.end_headers()
+            self.wfile.write(body)
+
+        def do_GET(self):
+            url = urlparse(self.path)
+            if url.path == "/health":
+                info = tdp_lookup.cache_info()
+                self.send_json(200, {"entries": len(tdp_lookup.index), "cache_hits": info.hits, "cache_misses": info.misses})
+                return
+            if url.path != "/lookup":
+                self.send_json(404, {"error": f"Unknown path {url.path}"})
+                return
+
+            query = parse_qs(url.query)
+            if "name" not in query:
+                self.send_json(400, {"error": "Missing 'name' parameter"})
+                return
+            usage = query.get("usage", [None])[0]
+            self.send_json(200, tdp_lookup.lookup(query["name"][0], usage))
+
+        def do_POST(self):
+            if urlparse(self.path).path != "/lookup":
+                self.send_json(404, {"error": f"Unknown path {self.path}"})
+                return
+            try:
+                length = int(self.headers.get("Content-Length", 0))
+                request = json.loads(self.rfile.read(length))
+                names = request["names"]
+                usage = request.get("usage")
+                if not isinstance(names, list) or not all(isinstance(name, str) for name in names):
+                    raise TypeError("names must be a list of strings")
+                if usage is not None and not isinstance(usage, str):
+                    raise TypeError("usage must be a string")
+            except (ValueError, KeyError, TypeError):
+                self.send_json(400, {"error": "Expected a JSON body like {\"names\": [...], \"usage\": \"local\"}"})
+                return
+            self.send_json(200, tdp_lookup.lookup_many(names, usage))
+
+        def log_message(self, format, *args):
+            # Keep the console quiet, a pipeline sends thousands of requests
+            pass
+
+    return LookupHandler
+
+
+def serve(cpu_tdp_csv, host=LOOKUP_HOST, port=LOOKUP_PORT):
+    tdp_lookup = TDPLookup.from_csv(cpu_tdp_csv)
+    if tdp_lookup is None:
+        return
+    server = ThreadingHTTPServer((host, port), make_handler(tdp_lookup))
+    print(f"✅ Serving TDP lookups for {len(tdp_lookup.index)} processors on http://{host}:{port}/lookup")
+    try:
+        server.serve_forever()
+    except KeyboardInterrupt:
+        pass
+    finally:
+        server.server_close()
+
+
+if __name__ == "__main__":
+    from scripts.cli import main as cli_main
+    cli_main(["serve", *sys.argv[1:]])
+
+    # Example usage: python -m scripts.serve_tdp_lookup nf-co2footprint/CPU_TDP_wikichip_2025-09-15.csv --port 8765
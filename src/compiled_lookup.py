@@ -0,0 +1,179 @@
+import math
+import mmap
+import os
+import struct
+import zlib
+from .name_normalization import normalize_processor_name
+from .tdp_lookup import get_default_row_name
+
+# Compiled, memory-mapped form of a processor table for CPU model -> TDP lookups.
+# Opening it only maps the file, so short-lived processes skip parsing the CSV and
+# share the pages through the OS page cache. Layout (little endian):
+#
+#   header   magic, number of records and hash slots, offsets of the sections
+#   slots    open addressing hash table of uint32 record numbers + 1 (0: empty),
+#            keyed by crc32 of the normalized name, linear probing
+#   records  fixed-width rows: (offset, length) into the string pool for every
+#            string field, followed by the numeric fields
+#   strings  UTF-8 string pool
+
+MAGIC = b"WCTDPLK1"
+HEADER = struct.Struct("<8sIIQQQ")
+SLOT = struct.Struct("<I")
+STRING_FIELDS = ("key", "name", "launch date", "source", "intended usage")
+# column -> struct format, missing values are stored as NaN ("d") or -1 ("i")
+NUMERIC_FIELDS = {"tdp (W)": "d", "cores": "i", "threads": "d", "process": "d", "die area": "d"}
+RECORD = struct.Struct("<" + "II" * len(STRING_FIELDS) + "".join(NUMERIC_FIELDS.values()))
+
+
+def get_compiled_lookup_path(csv_filename):
+    """
+    Returns the path of the compiled lookup file stored next to a CSV file,
+    e.g. data/CPU_TDP_wikichip_2025-09-15.lookup.bin
+    """
+    return f"{os.path.splitext(csv_filename)[0]}.lookup.bin"
+
+
+def hash_key(key_bytes):
+    # Stable across processes, unlike hash()
+    return zlib.crc32(key_bytes)
+
+
+def is_missing(value):
+    return value is None or (isinstance(value, float) and math.isnan(value)) or value == ""
+
+
+def pack_numeric(value, fmt):
+    if fmt == "i":
+        return -1 if is_missing(value) else int(value)
+    return math.nan if is_missing(value) else float(value)
+
+
+def save_compiled_lookup(rows, filename):
+    """
+    Compiles table rows (dicts with the processor columns, including the rows from
+    add_default_rows) into a lookup file. The first row per normalized name wins,
+    like in TDPLookup. The file is replaced atomically, so processes that still
+    map the previous file keep reading it unchanged.
+    """
+    strings = bytearray()
+    string_offsets = {}
+
+    def add_string(value):
+        data = b"" if is_missing(value) else str(value).encode("utf-8")
+        if data not in string_offsets:
+            string_offsets[data] = len(strings)
+            strings.extend(data)
+        return string_offsets[data], len(data)
+
+    keys = {}
+    records = []
+    for row in rows:
+        key = normalize_processor_name(row["name"])
+        if key in keys:
+            continue
+        keys[key] = len(records)
+        fields = []
+        for field in STRING_FIELDS:
+            fields.extend(add_string(key if field == "key" else row.get(field)))
+        fields.extend(pack_numeric(row.get(col), fmt) for col, fmt in NUMERIC_FIELDS.items())
+        records.append(RECORD.pack(*fields))
+
+    # Power of two with a load factor of at most 0.5
+    n_slots = 1
+    while n_slots < 2 * len(records):
+        n_slots *= 2
+    slots = [0] * n_slots
+    for key, record_number in keys.items():
+        slot = hash_key(key.encode("utf-8")) & (n_slots - 1)
+        while slots[slot]:
+            slot = (slot + 1) & (n_slots - 1)
+        slots[slot] = record_number + 1
+
+    slots_offset = HEADER.size
+    records_offset = slots_offset + n_slots * SLOT.size
+    strings_offset = records_offset + len(records) * RECORD.size
+    tmp_path = f"{filename}.tmp"
+    with open(tmp_path, "wb") as f:
+        f.write(HEADER.pack(MAGIC, len(records), n_slots, slots_offset, records_offset, strings_offset))
+        f.write(struct.pack(f"<{n_slots}I", *slots))
+        f.writelines(records)
+        f.write(strings)
+    os.replace(tmp_path, filename)
+    print(f"✅ Saved {len(records)} entries to {filename}")
+
+
+class CompiledTDPLookup:
+    """
+    CPU model -> TDP lookup over a file written by save_compiled_lookup, with the
+    same results as TDPLookup. Lookups hash the normalized name and read the
+    record straight from the memory map.
+
+    Args:
+        filename (str): Path of the compiled lookup file
+    """
+
+    def __init__(self, filename):
+        with open(filename, "rb") as f:
+            self.map = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+        magic, self.n_records, self.n_slots, self.slots_offset, self.records_offset, self.strings_offset = HEADER.unpack_from(self.map, 0)
+        if magic != MAGIC:
+            self.map.close()
+            raise ValueError(f"{filename} is not a compiled lookup file")
+
+    def close(self):
+        self.map.close()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
+
+    def __len__(self):
+        return self.n_records
+
+    def _string(self, offset, length):
+        start = self.strings_offset + offset
+        return self.map[start:start + length]
+
+    def _find(self, key):
+        key_bytes = key.encode("utf-8")
+        mask = self.n_slots - 1
+        slot = hash_key(key_bytes) & mask
+        while True:
+            (record_number,) = SLOT.unpack_from(self.map, self.slots_offset + slot * SLOT.size)
+            if not record_number:
+                return None
+            values = RECORD.unpack_from(self.map, self.records_offset + (record_number - 1) * RECORD.size)
+            if self._string(values[0], values[1]) == key_bytes:
+                return values
+            slot = (slot + 1) & mask
+
+    def _row(self, values):
+        row = {}
+        for i, field in enumerate(STRING_FIELDS[1:], start=1):
+            value = self._string(values[2 * i], values[2 * i + 1]).decode("utf-8")
+            row[field] = value or None
+        for (col, fmt), value in zip(NUMERIC_FIELDS.items(), values[2 * len(STRING_FIELDS):]):
+            row[col] = None if (value == -1 if fmt == "i" else math.isnan(value)) else value
+        return row
+
+    def lookup(self, name, usage=None):
+        """
+        Looks up one processor, see TDPLookup.lookup.
+
+        Returns:
+            dict: The table row plus "match" ("exact" or "default"), or None if the
+            table has neither the processor nor any default row
+        """
+        values = self._find(normalize_processor_name(name))
+        if values is not None:
+            return {**self._row(values), "match": "exact"}
+        values = self._find(get_default_row_name(usage)) or self._find("default")
+        if values is not None:
+            return {**self._row(values), "match": "default"}
+        return None
+
+    def lookup_many(self, names, usage=None):
+        return [self.lookup(name, usage) for name in names]
@@ -1,6 +1,69 @@
 API_URL = "https://en.wikichip.org/w/api.php"
+WIKICHIP_URL = "https://en.wikichip.org/"  # prefix of the source URL of scraped rows
 BATCH_SIZE = 20
+MIN_BATCH_SIZE = 1
+MAX_BATCH_SIZE = 50
+SLOW_ASK_LATENCY = 5.0  # seconds; slower ask responses shrink the adaptive batch size
+INFO_BATCH_SIZE = 50
+TITLE_QUEUE_SIZE = 2000  # titles listed ahead of the detail fetch
 MAX_RETRIES = 3
 DELAY_RANGE = (2.5, 4.5)
 EXPECTED_PROCESS_UNIT = "nm"
-EXPECTED_DIE_AREA_UNIT = "mm²"
\ No newline at end of file
+EXPECTED_DIE_AREA_UNIT = "mm²"
+# Column dtypes of binary snapshots; columns not listed keep the dtype pandas infers
+SNAPSHOT_SCHEMA = {
+    "name": "string",
+    "launch date": "datetime64[ns]",
+    "source": "string",
+    "intended usage": "category",
+    "tdp (W)": "float64",
+    "cores": "UInt16",
+    "threads": "float64",
+    "process": "float64",
+    "die area": "float64"
+}
+# Columns of the processor table, in order. Entries with a "property" are Semantic MediaWiki
+# properties requested by the ask queries; entries with a "field" are read from the page's
+# ask result itself. "converter" names a function in processor_parser.PROPERTY_CONVERTERS,
+# values in another "unit" than the given one are dropped with a warning, and pages
+# without a "required" value are left out.
+PROCESSOR_PROPERTIES = [
+    {"column": "name", "field": "displaytitle", "title_fallback": True},
+    {"column": "launch date", "property": "first launched", "converter": "date"},
+    {"column": "source", "field": "fullurl"},
+    {"column": "intended usage", "property": "market segment", "converter": "joined"},
+    {"column": "tdp (W)", "property": "tdp", "converter": "quantity", "required": True},
+    {"column": "cores", "property": "core count", "converter": "int", "required": True},
+    {"column": "threads", "property": "thread count", "converter": "int"},
+    {"column": "process", "property": "process", "converter": "quantity", "unit": EXPECTED_PROCESS_UNIT},
+    {"column": "die area", "property": "die area", "converter": "quantity", "unit": EXPECTED_DIE_AREA_UNIT}
+]
+PROCESSOR_COLUMNS = [spec["column"] for spec in PROCESSOR_PROPERTIES]
+# Rules for processors found in several merged sources, see merge_sources.
+# Columns without a rule take the value of the highest priority source.
+MERGE_RULES = {
+    "launch date": "newest",
+    "threads": "first_non_null",
+    "process": "first_non_null",
+    "die area": "first_non_null"
+}
+MAX_CONCURRENCY = 4
+RATE_LIMIT = 1.0  # requests per second across all workers
+RATE_BURST = 2
+
+CACHE_DIR = ".cache/wikichip_api"
+CACHE_TTL = 24 * 60 * 60  # seconds
+CACHE_MAX_ENTRIES = 10000
+
+ANALYZE_CHUNK_SIZE = 100_000  # rows of the larger table per chunk in streaming comparisons
+
+# Nearest-neighbour TDP estimates for processors missing from the table (cores first, required)
+ESTIMATOR_FEATURES = ["cores", "threads", "process", "die area"]
+ESTIMATOR_NEIGHBOURS = 5
+ESTIMATOR_LEAF_SIZE = 32
+
+LOOKUP_CACHE_SIZE = 65536
+LOOKUP_HOST = "127.0.0.1"
+LOOKUP_PORT = 8765
+
+CLI_STARTUP_BUDGET = 0.2  # seconds for "python -m scripts --help", checked by the benchmarks
@@ -0,0 +1,169 @@
+import re
+from collections import defaultdict
+import pandas as pd
+from .manipulate_proc_tables import VENDORS, get_normalized_names
+
+# Longest vendors first, so "intel nervana" wins over "intel"
+_VENDOR_PATTERN = re.compile(r"(?<!\S)(" + "|".join(map(re.escape, sorted(VENDORS, key=len, reverse=True))) + r")(?!\S)")
+_TOKEN_SPLIT_PATTERN = re.compile(r"[\s-]+")
+_MIN_BLOCK_TOKEN_LENGTH = 3
+# Words that may precede the family name, e.g. "intel mobile pentium ii 300"
+_FAMILY_QUALIFIERS = {"mobile", "embedded"}
+
+
+def get_vendor(name):
+    """
+    Returns the first vendor named anywhere in a normalized name, e.g. "amd" for
+    "7th gen amd athlon x4 950", or None.
+    """
+    match = _VENDOR_PATTERN.search(name)
+    return match.group(1) if match else None
+
+
+def get_family(name):
+    """
+    Returns the family of a normalized name: the first word after the vendor (or the
+    first word if there is no vendor), skipping qualifiers like "mobile", e.g. "athlon"
+    for "7th gen amd athlon x4 950". Returns None if that word is a model number.
+    """
+    match = _VENDOR_PATTERN.search(name)
+    words = name[match.end():].split() if match else name.split()
+    for word in words:
+        if word not in _FAMILY_QUALIFIERS:
+            return None if any(c.isdigit() for c in word) else word
+    return None
+
+
+def get_model_tokens(name, min_length=1):
+    """
+    Returns the model number tokens of a normalized name: every word or hyphen part
+    that contains a digit, e.g. {"i7-920xm", "i7", "920xm"} for "intel core i7-920xm".
+    """
+    tokens = set()
+    for word in name.split():
+        for token in [word, *_TOKEN_SPLIT_PATTERN.split(word)]:
+            if len(token) >= min_length and any(c.isdigit() for c in token):
+                tokens.add(token)
+    return tokens
+
+
+def get_model_numbers(name):
+    """
+    Returns the model numbers of a normalized name without the compound tokens, e.g.
+    {"i7", "920xm"} for "intel core i7-920xm", so "m-5y10" and "m 5y10" score alike.
+    """
+    return {token for token in _TOKEN_SPLIT_PATTERN.split(name) if any(c.isdigit() for c in token)}
+
+
+def get_trigrams(name):
+    padded = f"  {name} "
+    return {padded[i:i + 3] for i in range(len(padded) - 2)}
+
+
+def score_names(tokens1, trigrams1, tokens2, trigrams2):
+    """
+    Scores two names between 0 and 1. The Jaccard index of their model numbers
+    counts for 60%, the Dice coefficient of their character trigrams for 40%.
+    """
+    token_overlap = len(tokens1 & tokens2) / len(tokens1 | tokens2)
+    dice = 2 * len(trigrams1 & trigrams2) / (len(trigrams1) + len(trigrams2))
+    return round(0.6 * token_overlap + 0.4 * dice, 3)
+
+
+def build_model_index(names):
+    """
+    Builds an inverted index (vendor, model token) -> row positions.
+    Names without a known vendor are indexed under vendor None. Short tokens
+    like "i7" are left out because they would put half the table in one block.
+    """
+    index = defaultdict(list)
+    for pos, name in enumerate(names):
+        vendor = get_vendor(name)
+        for token in get_model_tokens(name, min_length=_MIN_BLOCK_TOKEN_LENGTH):
+            index[(vendor, token)].append(pos)
+    return index
+
+
+def get_fuzzy_matches(df1, df2, threshold=0.7, name_col="name", tdp_col="tdp (W)", cores_col="cores", label1="wikichip", label2="external"):
+    """
+    Finds likely matches between two processor tables whose normalized names differ,
+    e.g. the unmatched rows left over by get_matching_processors.
+
+    Candidates are only compared within the same block, i.e. when they share a model
+    number token and have the same vendor (or one of them has no vendor), so the
+    number of comparisons grows with the block sizes instead of len(df1) * len(df2).
+    Candidates of different families (e.g. "athlon" and "ryzen") are skipped.
+
+    Args:
+        df1 (pd.DataFrame): First table
+        df2 (pd.DataFrame): Second table
+        threshold (float): Minimum score for a candidate to be returned
+        name_col (str): Column name for processor names
+        tdp_col (str): Column name for TDP
+        cores_col (str): Column name for cores
+        label1 (str): Label for first table's columns
+        label2 (str): Label for second table's columns
+
+    Returns:
+        pd.DataFrame: Candidate pairs with their score, best candidates first for each row of df1
+    """
+    names1 = get_normalized_names(df1, name_col).tolist()
+    names2 = get_normalized_names(df2, name_col).tolist()
+    index2 = build_model_index(names2)
+
+    tokens2 = [get_model_numbers(name) for name in names2]
+    families2 = [get_family(name) for name in names2]
+    trigrams2 = {}
+    pairs = []
+
+    for pos1, name1 in enumerate(names1):
+        tokens1 = get_model_numbers(name1)
+        vendor1 = get_vendor(name1)
+        family1 = get_family(name1)
+
+        candidates = set()
+        for token in get_model_tokens(name1, min_length=_MIN_BLOCK_TOKEN_LENGTH):
+            candidates.update(index2.get((vendor1, token), []))
+            if vendor1 is None:
+                # No vendor on this side, so every vendor's block is a candidate
+                for vendor in VENDORS:
+                    candidates.update(index2.get((vendor, token), []))
+            else:
+                candidates.update(index2.get((None, token), []))
+
+        trigrams1 = get_trigrams(name1)
+        for pos2 in candidates:
+            if family1 and families2[pos2] and family1 != families2[pos2]:
+                continue
+            if pos2 not in trigrams2:
+                trigrams2[pos2] = get_trigrams(names2[pos2])
+            score = score_names(tokens1, trigrams1, tokens2[pos2], trigrams2[pos2])
+            if score >= threshold:
+                pairs.append((pos1, pos2, score))
+
+    columns = [
+        f"normalized_name_{label1}", f"normalized_name_{label2}", "score",
+        f"{name_col}_{label1}", f"{name_col}_{label2}",
+        f"{tdp_col}_{label1}", f"{tdp_col}_{label2}",
+        f"{cores_col}_{label1}", f"{cores_col}_{label2}"
+    ]
+    if not pairs:
+        return pd.DataFrame(columns=columns)
+
+    pos1, pos2, scores = zip(*pairs)
+    left = df1.iloc[list(pos1)]
+    right = df2.iloc[list(pos2)]
+    matches = pd.DataFrame({
+        f"normalized_name_{label1}": [names1[p] for p in pos1],
+        f"normalized_name_{label2}": [names2[p] for p in pos2],
+        "score": scores,
+        f"{name_col}_{label1}": left[name_col].to_numpy(),
+        f"{name_col}_{label2}": right[name_col].to_numpy(),
+        f"{tdp_col}_{label1}": left[tdp_col].to_numpy(),
+        f"{tdp_col}_{label2}": right[tdp_col].to_numpy(),
+        f"{cores_col}_{label1}": left[cores_col].to_numpy(),
+        f"{cores_col}_{label2}": right[cores_col].to_numpy()
+    })
+    return matches.sort_values(
+        [f"normalized_name_{label1}", "score"], ascending=[True, False], kind="stable"
+    ).reset_index(drop=True)
@@ -1,6 +1,7 @@
 import json
 import os
 import pandas as pd
+from .config import SNAPSHOT_SCHEMA
 
 def save_json_to_file(titles, filename):
     with open(filename, "w") as f:
@@ -30,3 +31,126 @@ def load_csv_from_file(filename):
     print(f"✅ Loaded DataFrame from {filename} with {len(df)} entries.")
     return df
 
+
+def apply_snapshot_schema(df):
+    """
+    Casts the columns listed in SNAPSHOT_SCHEMA to their declared dtypes: string
+    names and sources, categorical usage segments, compact integer types and parsed dates.
+    Values that cannot be converted become missing.
+    """
+    df = df.copy()
+    for col, dtype in SNAPSHOT_SCHEMA.items():
+        if col not in df.columns:
+            continue
+        if dtype.startswith("datetime"):
+            df[col] = pd.to_datetime(df[col], errors="coerce")
+        elif dtype in ("string", "category"):
+            df[col] = df[col].astype(dtype)
+        else:
+            df[col] = pd.to_numeric(df[col], errors="coerce").astype(dtype)
+    return df
+
+def save_df_to_parquet(df, filename):
+    """
+    Saves a DataFrame as a typed Parquet snapshot (see SNAPSHOT_SCHEMA).
+    """
+    apply_snapshot_schema(df).to_parquet(filename, index=False)
+    print(f"✅ Saved {len(df)} entries to {filename}")
+
+def load_parquet_from_file(filename, columns=None):
+    """
+    Loads a Parquet snapshot into a pandas DataFrame with its stored dtypes,
+    optionally reading only some of the columns.
+    """
+    if not os.path.exists(filename):
+        print(f"❌ File {filename} not found.")
+        return None
+    df = pd.read_parquet(filename, columns=columns)
+    print(f"✅ Loaded DataFrame from {filename} with {len(df)} entries.")
+    return df
+
+def load_table_from_file(filename):
+    """
+    Loads a processor table from a Parquet snapshot or a CSV file, depending on the extension.
+    """
+    if filename.endswith(".parquet"):
+        return load_parquet_from_file(filename)
+    return load_csv_from_file(filename)
+
+def iter_table_chunks(filename, chunk_size):
+    """
+    Reads a processor table from a Parquet snapshot or a CSV file in DataFrames of
+    up to chunk_size rows, so tables larger than memory can be processed.
+    """
+    if filename.endswith(".parquet"):
+        import pyarrow.parquet as pq
+        for batch in pq.ParquetFile(filename).iter_batches(batch_size=chunk_size):
+            yield batch.to_pandas()
+    else:
+        yield from pd.read_csv(filename, chunksize=chunk_size)
+
+def append_df_to_csv(df, filename, header):
+    """
+    Writes df to filename, or appends it without a header when header is False.
+    """
+    df.to_csv(filename, mode="w" if header else "a", header=header, index=False)
+
+def get_snapshot_path(csv_filename):
+    """
+    Returns the path of the Parquet snapshot stored next to a CSV file,
+    e.g. data/CPU_TDP_wikichip_2025-09-15.parquet
+    """
+    return f"{os.path.splitext(csv_filename)[0]}.parquet"
+
+def append_jsonl_record(record, filename):
+    """
+    Appends one JSON record as a line to filename and flushes it to disk,
+    so the record survives a crash right after this call returns.
+    """
+    with open(filename, "a") as f:
+        f.write(json.dumps(record) + "\n")
+        f.flush()
+        os.fsync(f.fileno())
+
+def load_jsonl_records(filename):
+    """
+    Yields the records of a JSONL file. A truncated last line (e.g. from a crash
+    in the middle of a write) is skipped.
+    """
+    if not os.path.exists(filename):
+        return
+    with open(filename, "r") as f:
+        for line in f:
+            try:
+                yield json.loads(line)
+            except json.JSONDecodeError:
+                print(f"❌ Skipping unreadable line in {filename}")
+
+def load_checkpoint_titles(filename):
+    """
+    Returns the set of titles whose batches are recorded in a scrape checkpoint file.
+    Titles of failed batches are not recorded.
+    """
+    return {title for record in load_jsonl_records(filename) for title in record["titles"]}
+
+
+def load_checkpoint_df(filename, columns):
+    """
+    Builds a DataFrame from the batch records of a scrape checkpoint file.
+    Rows are ordered by the position of their title in the title list, so the
+    result depends neither on the order in which batches finished nor on how
+    a resumed scrape batched the remaining titles.
+    """
+    records = sorted(load_jsonl_records(filename), key=lambda record: record["start"])
+    data = {column: [] for column in columns}
+    positions = []
+    for record in records:
+        batch_columns = record["columns"]
+        n_rows = len(next(iter(batch_columns.values()), []))
+        for column in columns:
+            data[column].extend(batch_columns.get(column) or [None] * n_rows)
+        positions.extend(record["positions"])
+    df = pd.DataFrame(data, columns=columns)
+    df = df.iloc[pd.Series(positions, dtype="int64").argsort(kind="stable")].reset_index(drop=True)
+    print(f"✅ Loaded {len(df)} entries from {len(records)} checkpointed batches in {filename}")
+    return df
@@ -1,5 +1,103 @@
 import pandas as pd
 import re
+from .name_normalization import (
+    VENDORS, NON_WORD_PATTERN, WHITESPACE_PATTERN, VENDOR_SUFFIX_PATTERN, VENDOR_END_PATTERN,
+    normalize_text, reorder_vendor, normalize_processor_name, _reorder_vendor_match
+)
+
+# Segment patterns for each default row group
+DEFAULT_ROW_PATTERNS = {
+    "default compute cluster": r"compute cluster|server|cloud|workstation|hpc|supercomputer|artificial intelligence|commercial|military|industrial",
+    "default local": r"local|desktop|mobile|enthusiast",
+    "default cloud": r"cloud|cloud computing|aws|azure|google cloud|oracle cloud",
+    "default embedded": r"embedded"
+}
+DEFAULT_ROW_NAMES = [*DEFAULT_ROW_PATTERNS, "default"]
+DEFAULT_ROW_SEGMENT_PATTERNS = {name: re.compile(pattern, re.IGNORECASE) for name, pattern in DEFAULT_ROW_PATTERNS.items()}
+
+# Raw name -> normalized name, shared by all calls of normalize_processor_column
+NORMALIZED_NAME_CACHE_SIZE = 1_000_000
+_normalized_name_cache = {}
+
+def split_usage_segments(entries: pd.Series) -> pd.Series:
+    """
+    Splits "intended usage" entries like "Desktop, Mobile" or "cloud; edge" into one
+    stripped segment per row. The index of the result points back to the entry.
+    Each distinct entry is only split once, since tables repeat a handful of entries.
+    """
+    entries = entries.dropna().astype(str)
+    codes, unique_entries = pd.factorize(entries)
+    segments = pd.Series(unique_entries, dtype=object).str.replace(",", ";", regex=False).str.split(";").explode().str.strip()
+    segments = segments[segments.notna() & (segments != "")]
+    expanded = pd.DataFrame({"code": codes, "row": entries.index}).merge(
+        pd.DataFrame({"code": segments.index, "segment": segments.to_numpy()}), on="code"
+    )
+    return pd.Series(expanded["segment"].to_numpy(), index=expanded["row"].to_numpy(), dtype=object)
+
+def aggregate_usage_segments(df, by="group"):
+    """
+    Computes TDP-per-core and threads-per-core statistics for processors with a known
+    TDP and core count, in a single pass over the exploded "intended usage" segments.
+
+    Args:
+        df (pd.DataFrame): Processor table
+        by (str): "group" to aggregate per default row group (see DEFAULT_ROW_PATTERNS,
+            plus "default" for all processors), or "segment" to aggregate per raw segment
+
+    Returns:
+        pd.DataFrame: One row per group or segment with count, mean, median and percentiles
+        of TDP per core, mean and median threads per core, and the "; "-joined sorted
+        segments that were assigned to it
+    """
+    df = df.reset_index(drop=True)
+    tdp = pd.to_numeric(df["tdp (W)"], errors="coerce")
+    cores = pd.to_numeric(df["cores"], errors="coerce")
+    threads = pd.to_numeric(df["threads"], errors="coerce")
+    valid = cores.notna() & (cores > 0) & tdp.notna()
+    metrics = pd.DataFrame({
+        "tdp_per_core": tdp[valid] / cores[valid],
+        "threads_per_core": threads[valid] / cores[valid]
+    })
+
+    segments = split_usage_segments(df.loc[valid, "intended usage"])
+    members = pd.DataFrame({"row": segments.index, "segment": segments.to_numpy()})
+
+    if by == "segment":
+        members["key"] = members["segment"]
+        rows = members[["key", "row"]].drop_duplicates()
+    else:
+        # Classify each distinct segment once, then attach the groups to every processor
+        unique_segments = pd.Series(members["segment"].unique(), dtype=object)
+        group_members = []
+        for name, pattern in DEFAULT_ROW_SEGMENT_PATTERNS.items():
+            matched = set(unique_segments[unique_segments.str.contains(pattern, regex=True)])
+            group_members.append(members[members["segment"].isin(matched)].assign(key=name))
+        rows = pd.concat(group_members, ignore_index=True)[["key", "row"]].drop_duplicates()
+        # The general default row covers all processors, with or without segments
+        group_members.append(members.assign(key="default"))
+        rows = pd.concat([rows, pd.DataFrame({"key": "default", "row": metrics.index})], ignore_index=True)
+        members = pd.concat(group_members, ignore_index=True)
+
+    segment_names = members.groupby("key")["segment"].agg(lambda segs: "; ".join(sorted(set(segs))))
+    rows = rows.join(metrics, on="row")
+
+    grouped = rows.groupby("key")
+    stats = grouped.agg(
+        count=("row", "size"),
+        tdp_per_core_mean=("tdp_per_core", "mean"),
+        tdp_per_core_median=("tdp_per_core", "median"),
+        threads_per_core_mean=("threads_per_core", "mean"),
+        threads_per_core_median=("threads_per_core", "median")
+    )
+    quantiles = {0.1: "tdp_per_core_p10", 0.25: "tdp_per_core_p25", 0.75: "tdp_per_core_p75", 0.9: "tdp_per_core_p90"}
+    percentiles = grouped["tdp_per_core"].quantile(list(quantiles)).unstack().reindex(columns=list(quantiles)).rename(columns=quantiles)
+    stats = stats.join(percentiles)[[
+        "count", "tdp_per_core_mean", "tdp_per_core_median", *quantiles.values(),
+        "threads_per_core_mean", "threads_per_core_median"
+    ]]
+    stats["segments"] = segment_names.reindex(stats.index).fillna("")
+    stats.index.name = by
+    return stats
 
 def add_default_rows(df):
     """
@@ -12,77 +110,35 @@ def add_default_rows(df):
     df["cores"] = pd.to_numeric(df["cores"], errors="coerce")
     df["threads"] = pd.to_numeric(df["threads"], errors="coerce")
 
-    # Define segment patterns for each group
-    patterns = {
-        "default compute cluster": r"compute cluster|server|cloud|workstation|hpc|supercomputer|artificial intelligence|commercial|military|industrial",
-        "default local": r"local|desktop|mobile|enthusiast",
-        "default cloud": r"cloud|cloud computing|aws|azure|google cloud|oracle cloud",
-        "default embedded": r"embedded"
-    }
-
     existing_names = set(df["name"].str.lower().dropna())
+    stats = aggregate_usage_segments(df)
     new_rows = []
 
-    for name, pattern in patterns.items():
-        if name.lower() in existing_names:
-            continue  # Skip if already present
-
-        mask = df["intended usage"].str.contains(pattern, case=False, na=False)
-        filtered = df[mask & df["cores"].notna() & (df["cores"] > 0) & df["tdp (W)"].notna()]
-        if filtered.empty:
-            continue
-
-        # Collect only the segments that match the pattern
-        matched_segments = set()
-        for entry in filtered["intended usage"].dropna():
-            for seg in str(entry).replace(',', ';').split(';'):
-                seg = seg.strip()
-                # Only add if this segment matches the pattern
-                if seg and pd.Series([seg]).str.contains(pattern, case=False, na=False).any():
-                    matched_segments.add(seg)
-        if not matched_segments:
+    for name in DEFAULT_ROW_NAMES:
+        # Skip if already present, or if no processor with TDP and cores belongs to the group
+        if name in existing_names or name not in stats.index:
             continue
-
-        tdp_per_core = (filtered["tdp (W)"] / filtered["cores"]).mean()
-        threads_per_core = (filtered["threads"] / filtered["cores"]).mean() if "threads" in filtered else None
-
+        group = stats.loc[name]
         new_rows.append({
             "name": name,
             "launch date": "",
             "source": "",
-            "intended usage": "; ".join(sorted(matched_segments)),
-            "tdp (W)": round(tdp_per_core, 2),
+            "intended usage": group["segments"],
+            "tdp (W)": round(group["tdp_per_core_mean"], 2),
             "cores": 1,
-            "threads": round(threads_per_core, 2) if threads_per_core is not None else None
+            "threads": round(group["threads_per_core_mean"], 2)
         })
 
-    # Add a general default row for all processors if not already present
-    if "default" not in existing_names:
-        filtered_all = df[df["cores"].notna() & (df["cores"] > 0) & df["tdp (W)"].notna()]
-        if not filtered_all.empty:
-            tdp_per_core_all = (filtered_all["tdp (W)"] / filtered_all["cores"]).mean()
-            threads_per_core_all = (filtered_all["threads"] / filtered_all["cores"]).mean() if "threads" in filtered_all else None
-            # Collect all uniqueintended usages in the table
-            all_segments = set()
-            for entry in filtered_all["intended usage"].dropna():
-                for seg in str(entry).replace(',', ';').split(';'):
-                    seg = seg.strip()
-                    if seg:
-                        all_segments.add(seg)
-            new_rows.append({
-                "name": "default",
-                "launch date": "",
-                "source": "",
-                "intended usage": "; ".join(sorted(all_segments)),
-                "tdp (W)": round(tdp_per_core_all, 2),
-                "cores": 1,
-                "threads": round(threads_per_core_all, 2) if threads_per_core_all is not None else None
-            })
-
     if new_rows:
         df = pd.concat([df, pd.DataFrame(new_rows)], ignore_index=True)
     return df
 
+def drop_default_rows(df):
+    """
+    Removes the rows added by add_default_rows, so they can be recomputed after the table changed.
+    """
+    return df[~df["name"].str.lower().isin(DEFAULT_ROW_NAMES)].reset_index(drop=True)
+
 def append_matching_columns(df1, df2):
     """
     Appends rows from df2 to df1, including only columns that exist in df1.
@@ -95,38 +151,58 @@ def append_matching_columns(df1, df2):
     # Append and return
     return pd.concat([df1, df2_aligned], ignore_index=True)
 
-def drop_duplicate_names(df):
+def _normalize_strings(names: pd.Series) -> pd.Series:
     """
-    Removes duplicate rows based on the 'name' column, keeping only the first occurrence.
-    Returns the cleaned DataFrame.
+    Vectorized equivalent of normalize_processor_name for a Series of strings.
     """
-    return df.drop_duplicates(subset=["name"], keep="first").reset_index(drop=True)
-
-def normalize_text(name: str) -> str:
-    if not isinstance(name, str):
-        return ""
-    name = name.lower()
-    name = name.replace("®", "").replace("™", "")
-    name = name.replace("processor", "")
-    name = re.sub(r"[^\w\s-]", "", name)  # preserve hyphens in model names
-    name = re.sub(r"\s+", " ", name).strip()
-    return name
-
-def reorder_vendor(name: str) -> str:
-    # Matches formats like "Core i5-7200U - Intel"
-    match = re.match(r"(.+?)\s*-\s*(intel|amd|arm|apple|qualcomm|via|motorola|samsung|ibm|nvidia|rockchip|hisilicon|centaur|zhaoxin|tesla|ampere|mobileye|phytium|intel nervana|socionext|appliedmicro|baikal electronics)$", name, re.IGNORECASE)
-    if match:
-        chip, vendor = match.groups()
-        return f"{vendor.strip()} {chip.strip()}"
-    return name
-
-def normalize_processor_name(name: str) -> str:
-    name = normalize_text(name)
-    name = reorder_vendor(name)
-    return name.strip()
+    names = names.str.lower()
+    names = names.str.replace("®", "", regex=False).str.replace("™", "", regex=False)
+    names = names.str.replace("processor", "", regex=False)
+    names = names.str.replace(NON_WORD_PATTERN, "", regex=True)
+    # Same as collapsing \s+ to a single space and stripping, but cheaper than a regex
+    names = names.str.split().str.join(" ")
+    # Only names ending in "- <vendor>" can be reordered, skip the expensive pattern for the rest
+    has_vendor_suffix = names.str.contains(VENDOR_END_PATTERN, regex=True)
+    names[has_vendor_suffix] = names[has_vendor_suffix].str.replace(VENDOR_SUFFIX_PATTERN, _reorder_vendor_match, regex=True).str.strip()
+    return names
 
 def normalize_processor_column(column) -> pd.Series:
-    return column.apply(normalize_processor_name)
+    """
+    Normalizes a column of processor names, giving the same result as applying
+    normalize_processor_name to every row. Each distinct raw name is normalized
+    only once and remembered in a module-level cache, so repeated names and
+    repeated calls on the same table are close to free.
+    """
+    is_str = column.map(lambda name: isinstance(name, str))
+    names = column[is_str]
+
+    # Mapping through the whole cache would cost time in its size on every call
+    mapping = {}
+    pending = []
+    for name in pd.unique(names):
+        if name in _normalized_name_cache:
+            mapping[name] = _normalized_name_cache[name]
+        else:
+            pending.append(name)
+    if pending:
+        normalized = _normalize_strings(pd.Series(pending, dtype=object))
+        mapping.update(zip(pending, normalized))
+        if len(_normalized_name_cache) + len(pending) > NORMALIZED_NAME_CACHE_SIZE:
+            _normalized_name_cache.clear()
+        _normalized_name_cache.update(zip(pending, normalized))
+
+    result = pd.Series("", index=column.index, dtype=object)
+    result[is_str] = names.map(mapping)
+    return result
+
+def get_normalized_names(df, name_col="name") -> pd.Series:
+    """
+    Returns the normalized names of a table, reusing its "normalized_name" column
+    if the table has already been normalized.
+    """
+    if "normalized_name" in df.columns:
+        return df["normalized_name"]
+    return normalize_processor_column(df[name_col])
 
 def drop_duplicate_names(df):
     """
@@ -141,19 +217,93 @@ def drop_duplicate_names(df):
     print(f"Removed {removed} duplicate rows based on 'name'.")
     return df_clean
 
+def _is_missing(value):
+    # "", None, NaN, NaT and pd.NA (from the nullable columns of Parquet snapshots)
+    if isinstance(value, str):
+        return value == ""
+    return pd.api.types.is_scalar(value) and bool(pd.isna(value))
+
+def merge_sources(sources, columns=None, rules=None):
+    """
+    Merges processor tables from several sources in one pass over their rows, keyed
+    by normalized name (which also becomes the "name" column), without building a
+    concatenated copy first. Processors keep the position of their first appearance.
+
+    Args:
+        sources (list): (label, DataFrame) pairs, highest priority first. Missing (None) tables are skipped.
+        columns (list): Columns of the merged table (default: the columns of the first table)
+        rules (dict): Column -> rule for processors found in several sources (see MERGE_RULES):
+            "first" (default): the value of the highest priority row, even if missing
+            "first_non_null": the highest priority value that is not missing
+            "newest": the latest value, compared as dates
+
+    Returns:
+        tuple: (merged DataFrame, DataFrame with the name and, for every other column,
+        the label of the source that supplied the value or None if it is missing)
+    """
+    rules = {col: rule for col, rule in (rules or {}).items() if rule != "first"}
+    unknown = set(rules.values()) - {"first_non_null", "newest"}
+    if unknown:
+        raise ValueError(f"Unknown merge rules: {sorted(unknown)}")
+    sources = [(label, df) for label, df in sources if df is not None]
+    if columns is None:
+        columns = list(sources[0][1].columns) if sources else ["name"]
+    value_cols = [col for col in columns if col != "name"]
+    rules = {col: rule for col, rule in rules.items() if col in value_cols}
+
+    index = {}
+    names = []
+    values = {col: [] for col in value_cols}
+    supplied = {col: [] for col in value_cols}
+    # Parsed dates of the merged rows for the "newest" columns
+    dates = {col: [] for col, rule in rules.items() if rule == "newest"}
+
+    for label, df in sources:
+        source_names = get_normalized_names(df).tolist()
+        source_values = {col: df[col].tolist() if col in df.columns else [None] * len(df) for col in value_cols}
+        source_dates = {
+            col: pd.to_datetime(df[col], errors="coerce", format="mixed", utc=True).tolist() if col in df.columns else [None] * len(df)
+            for col in dates
+        }
+
+        for pos, name in enumerate(source_names):
+            row = index.get(name)
+            if row is None:
+                index[name] = len(names)
+                names.append(name)
+                for col in value_cols:
+                    value = source_values[col][pos]
+                    values[col].append(value)
+                    supplied[col].append(None if _is_missing(value) else label)
+                for col in dates:
+                    dates[col].append(source_dates[col][pos])
+                continue
+
+            for col, rule in rules.items():
+                value = source_values[col][pos]
+                if _is_missing(value):
+                    continue
+                if rule == "first_non_null":
+                    replace = supplied[col][row] is None
+                else:
+                    date = source_dates[col][pos]
+                    replace = not _is_missing(date) and (_is_missing(dates[col][row]) or date > dates[col][row])
+                    if replace:
+                        dates[col][row] = date
+                if replace:
+                    values[col][row] = value
+                    supplied[col][row] = label
+
+    merged = pd.DataFrame({"name": names, **values}, columns=columns)
+    field_sources = pd.DataFrame({"name": names, **supplied}, columns=["name", *value_cols])
+    print(f"Merged {sum(len(df) for _, df in sources)} rows from {len(sources)} sources into {len(merged)} processors.")
+    return merged, field_sources
+
 def print_market_segment_counts(df, col="intended usage"):
     """
     Prints all unique intended usages and their counts in a readable format.
     """
-    from collections import Counter
-
-    segments = []
-    for entry in df[col].dropna():
-        for seg in str(entry).replace(',', ';').split(';'):
-            seg = seg.strip()
-            if seg:
-                segments.append(seg)
-    counts = Counter(segments)
+    counts = split_usage_segments(df[col]).value_counts().sort_index()
     print("Unique mintended usages and their counts:")
-    for seg, count in sorted(counts.items()):
+    for seg, count in counts.items():
         print(f"  {seg}: {count}")
\ No newline at end of file
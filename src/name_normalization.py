@@ -0,0 +1,42 @@
+import re
+
+# Pure string normalization of processor names, kept free of pandas so that
+# lookups and the command line can use it without the import cost.
+
+VENDORS = [
+    "intel", "amd", "arm", "apple", "qualcomm", "via", "motorola", "samsung", "ibm", "nvidia",
+    "rockchip", "hisilicon", "centaur", "zhaoxin", "tesla", "ampere", "mobileye", "phytium",
+    "intel nervana", "socionext", "appliedmicro", "baikal electronics"
+]
+NON_WORD_PATTERN = re.compile(r"[^\w\s-]")
+WHITESPACE_PATTERN = re.compile(r"\s+")
+VENDOR_SUFFIX_PATTERN = re.compile(rf"^(.+?)\s*-\s*({'|'.join(VENDORS)})$", re.IGNORECASE)
+VENDOR_END_PATTERN = re.compile(rf"-\s*(?:{'|'.join(VENDORS)})$", re.IGNORECASE)
+
+
+def normalize_text(name: str) -> str:
+    if not isinstance(name, str):
+        return ""
+    name = name.lower()
+    name = name.replace("®", "").replace("™", "")
+    name = name.replace("processor", "")
+    name = NON_WORD_PATTERN.sub("", name)  # preserve hyphens in model names
+    name = WHITESPACE_PATTERN.sub(" ", name).strip()
+    return name
+
+def reorder_vendor(name: str) -> str:
+    # Matches formats like "Core i5-7200U - Intel"
+    match = VENDOR_SUFFIX_PATTERN.match(name)
+    if match:
+        chip, vendor = match.groups()
+        return f"{vendor.strip()} {chip.strip()}"
+    return name
+
+def normalize_processor_name(name: str) -> str:
+    name = normalize_text(name)
+    name = reorder_vendor(name)
+    return name.strip()
+
+def _reorder_vendor_match(match):
+    chip, vendor = match.groups()
+    return f"{vendor.strip()} {chip.strip()}"
@@ -1,18 +1,93 @@
-from .config import API_URL, MAX_RETRIES, DELAY_RANGE, EXPECTED_PROCESS_UNIT, EXPECTED_DIE_AREA_UNIT
+from .config import API_URL, BATCH_SIZE, MIN_BATCH_SIZE, MAX_BATCH_SIZE, SLOW_ASK_LATENCY, MAX_RETRIES, DELAY_RANGE, PROCESSOR_PROPERTIES, MAX_CONCURRENCY, RATE_LIMIT, RATE_BURST, INFO_BATCH_SIZE, TITLE_QUEUE_SIZE
+from .io_utils import append_jsonl_record, load_jsonl_records
+from .telemetry import telemetry, log_event, get_request_kind
+import logging
+import os
+import queue
 import random
+import threading
 import time
+from concurrent.futures import ThreadPoolExecutor
 from datetime import datetime, timezone
-import requests
-import json
+from functools import lru_cache
 
-session = requests.Session()
+session = None
+session_lock = threading.Lock()
+response_cache = None
 
 
-def get_all_page_titles():
+def get_session():
     """
-    Retrieves all page titles listed in the 'all microprocessor models' category.
+    Returns the requests.Session shared by all API requests, creating it on first use
+    so that importing this module stays cheap.
+    """
+    global session
+    if session is None:
+        with session_lock:
+            if session is None:
+                import requests
+                session = requests.Session()
+    return session
+
+
+def set_response_cache(cache):
+    """
+    Sets the ResponseCache used by all API requests, or None to disable caching.
+    """
+    global response_cache
+    response_cache = cache
+
+
+def api_get(params, limiter=None, use_cache=True):
+    """
+    Sends one GET request to the API, answering it from the response cache when possible.
+
+    Args:
+        params (dict): Request parameters
+        limiter (TokenBucket): Optional rate limiter, only acquired for requests that hit the network
+        use_cache (bool): Whether to read and write the response cache
+
+    Returns:
+        (resp, cached): The parsed JSON response and whether it came from the cache
+    """
+    kind = get_request_kind(params)
+    cache = response_cache if use_cache else None
+    if cache is not None:
+        resp = cache.get(params)
+        if resp is not None:
+            telemetry.record_request(kind, 0.0, 0, cached=True)
+            return resp, True
+
+    if limiter:
+        limiter.acquire()
+    start = time.perf_counter()
+    try:
+        response = get_session().get(API_URL, params=params)
+    except Exception:
+        telemetry.record_request(kind, time.perf_counter() - start, 0, error=True)
+        raise
+    latency = time.perf_counter() - start
+    try:
+        resp = response.json()
+    except Exception as e:
+        telemetry.record_request(kind, latency, len(response.content), status=response.status_code, error=True)
+        log_event(logging.WARNING, f"Failed to parse JSON (status {response.status_code})", event="bad_response",
+                  kind=kind, status=response.status_code, body=response.text[:300])
+        raise e
+    telemetry.record_request(kind, latency, len(response.content), status=response.status_code, error="error" in resp)
+
+    # API-level errors are not cached so they are retried on the next run
+    if cache is not None and "error" not in resp:
+        cache.set(params, resp)
+    return resp, False
+
+
+def iter_page_titles(use_cache=True):
+    """
+    Yields the page titles listed in the 'all microprocessor models' category page by page,
+    requesting the largest page size the API allows. Pass use_cache=False when the listing
+    must be current, e.g. to find new pages in an incremental scrape.
     """
-    titles = []
     cont = None
 
     while True:
@@ -21,129 +96,583 @@ def get_all_page_titles():
             "format": "json",
             "list": "categorymembers",
             "cmtitle": "Category:all microprocessor models",
-            "cmlimit": "50"
+            "cmlimit": "max"
         }
         if cont:
             params["cmcontinue"] = cont
 
-        response = session.get(API_URL, params=params)
-
-        try:
-            resp = response.json()
-        except Exception as e:
-            print("❌ Failed to parse JSON!")
-            print("Status code:", response.status_code)
-            print("Raw response (first 300 chars):")
-            print(response.text[:300])
-            raise e
+        resp, cached = api_get(params, use_cache=use_cache)
 
         members = resp.get("query", {}).get("categorymembers", [])
-        titles.extend([m["title"] for m in members])
+        for m in members:
+            yield m["title"]
 
         cont = resp.get("continue", {}).get("cmcontinue")
         if not cont:
             break
 
-        time.sleep(1)
-    
-    print(f"✅ Total titles retrieved: {len(titles)}")
+        if not cached:
+            time.sleep(1)
+
+
+def get_all_page_titles(use_cache=True):
+    """
+    Retrieves all page titles listed in the 'all microprocessor models' category.
+    """
+    titles = list(iter_page_titles(use_cache))
+    log_event(logging.INFO, f"✅ Total titles retrieved: {len(titles)}", event="titles", count=len(titles))
     return titles
 
 
 
-def get_processor_data(titles, batch_size):
+def get_page_revisions(titles, batch_size=INFO_BATCH_SIZE, use_cache=True):
     """
-    Fetches processor metadata from WikiChip for given titles.
+    Retrieves the latest revision ID, touched timestamp and full URL for each title.
+
+    Args:
+        titles (list): Page titles to look up
+        batch_size (int): Titles per request (the API accepts at most 50)
+        use_cache (bool): Whether to answer from the response cache; pass False when the
+            revisions must be current, e.g. to find edited pages in an incremental scrape
 
     Returns:
-        List of tuples: (title, source, launch_date, tdp, cores, threads)
+        dict: title -> {"lastrevid": int, "touched": str, "fullurl": str}; missing pages are left out
     """
-    results = []
+    revisions = {}
     total_batches = (len(titles) + batch_size - 1) // batch_size
 
     for batch_idx in range(0, len(titles), batch_size):
         batch = titles[batch_idx:batch_idx + batch_size]
-        query_str = " OR ".join(f"[[{t}]]" for t in batch)
-        ask_query = f"{query_str}|?tdp|?first launched|?core count|?thread count|?model|?name|?market segment|?process|?die area"
-
         params = {
-            "action": "ask",
+            "action": "query",
             "format": "json",
-            "query": ask_query
+            "prop": "info",
+            "inprop": "url",
+            "titles": "|".join(batch)
         }
 
-        for attempt in range(MAX_RETRIES):
-            try:
-                response = session.get(API_URL, params=params)
-                resp = response.json()
-
-                # Check for API-level errors (e.g. query too complex)
-                if "error" in resp:
-                    print(f"🚨 API Error in batch {batch_idx // batch_size + 1}/{total_batches}")
-                    print("➡️  Message:", json.dumps(resp["error"], indent=2))
-                    break  # Skip this batch entirely
-                break  # success
-            except Exception as e:
-                print(f"❌ Attempt {attempt + 1} failed for batch {batch_idx // batch_size + 1}/{total_batches}")
-                print("Status code:", response.status_code if 'response' in locals() else "unknown")
-                print("First part of response:", response.text[:300] if 'response' in locals() else "no response")
-                time.sleep(5)
-        else:
-            print(f"❌ Skipping batch {batch_idx // batch_size + 1} after {MAX_RETRIES} failed attempts.")
-            continue
+        resp, cached = api_get(params, use_cache=use_cache)
 
-        # If no error, process the actual data
-        ask_results = resp.get("query", {}).get("results", {})
-
-        for title, data in ask_results.items():
-            printouts = data.get("printouts", {})
-            launch_date_list = printouts.get("first launched", [])
-            tdp_list = printouts.get("tdp", [])
-            cores_list = printouts.get("core count", [])
-            threads_list = printouts.get("thread count", [])
-            market_segment_list = printouts.get("market segment", [])
-            process_list = printouts.get("process", [])
-            die_area_list = printouts.get("die area", [])
-            #print(f"process list: {process_list}")
-            #print(f"die area list: {die_area_list}")
-
-            launch_date = launch_date_list[0]["timestamp"] if launch_date_list and "timestamp" in launch_date_list[0] else None
-            tdp = tdp_list[0]["value"] if tdp_list and "value" in tdp_list[0] else None
-            cores = int(cores_list[0]) if cores_list else None
-            threads = int(threads_list[0]) if threads_list else None
-            # Join all market segments as a single string, or None if empty
-            market_segment = "; ".join(str(seg) for seg in market_segment_list) if market_segment_list else None
-            
-            # Process
-            if process_list and "value" in process_list[0] and "unit" in process_list[0]:
-                if process_list[0]["unit"] == EXPECTED_PROCESS_UNIT:
-                    process = process_list[0]["value"]
-                else:
-                    print(f"Warning: Unexpected unit for process: {process_list[0]['unit']}")
-                    process = None
+        # The API returns canonical titles (e.g. capitalized), map them back to ours
+        query = resp.get("query", {})
+        canonical = {t: t for t in batch}
+        for entry in query.get("normalized", []):
+            canonical[entry["to"]] = entry["from"]
+
+        for page in query.get("pages", {}).values():
+            if "missing" in page or "lastrevid" not in page:
+                continue
+            title = canonical.get(page["title"], page["title"])
+            revisions[title] = {
+                "lastrevid": page["lastrevid"],
+                "touched": page.get("touched"),
+                "fullurl": page.get("fullurl")
+            }
+
+        log_event(logging.INFO, f"✅ Fetched revisions for batch {batch_idx // batch_size + 1}/{total_batches}",
+                  event="revisions_batch", batch=f"{batch_idx // batch_size + 1}/{total_batches}", cached=cached)
+        if not cached:
+            time.sleep(1)
+
+    return revisions
+
+
+def get_changed_titles(titles, previous_revisions, current_revisions):
+    """
+    Compares two revision maps and returns the titles that need to be fetched again.
+
+    Returns:
+        (changed, removed): titles that are new or have a different revision ID,
+        and titles from the previous snapshot that no longer exist
+    """
+    changed = []
+    for title in titles:
+        previous = previous_revisions.get(title)
+        current = current_revisions.get(title)
+        if previous is None or current is None or previous.get("lastrevid") != current.get("lastrevid"):
+            changed.append(title)
+    current_titles = set(titles)
+    removed = [title for title in previous_revisions if title not in current_titles]
+    return changed, removed
+
+
+class TokenBucket:
+    """
+    Thread-safe token bucket shared by all fetch workers.
+
+    Args:
+        rate (float): Tokens added per second
+        burst (int): Maximum number of tokens that can be saved up
+    """
+
+    def __init__(self, rate, burst):
+        if not rate > 0:
+            raise ValueError(f"Rate limit must be positive, got {rate}")
+        self.rate = rate
+        self.capacity = max(1, burst)
+        self.tokens = float(self.capacity)
+        self.updated = time.monotonic()
+        self.lock = threading.Lock()
+
+    def acquire(self):
+        """
+        Blocks until a token is available and consumes it.
+        """
+        while True:
+            with self.lock:
+                now = time.monotonic()
+                self.tokens = min(self.capacity, self.tokens + (now - self.updated) * self.rate)
+                self.updated = now
+                if self.tokens >= 1:
+                    self.tokens -= 1
+                    return
+                wait = (1 - self.tokens) / self.rate
+            time.sleep(wait)
+
+
+class AdaptiveBatchSizer:
+    """
+    Thread-safe ask batch size that adapts to the server (additive increase,
+    multiplicative decrease): it grows by `step` titles after every fast, error-free
+    response and halves after an error or a response slower than slow_latency.
+
+    Args:
+        initial (int): Starting batch size
+        minimum (int): Smallest batch size
+        maximum (int): Largest batch size
+        slow_latency (float): Seconds after which a response counts as slow
+        step (int): Titles added after every fast, error-free response
+    """
+
+    def __init__(self, initial=BATCH_SIZE, minimum=MIN_BATCH_SIZE, maximum=MAX_BATCH_SIZE, slow_latency=SLOW_ASK_LATENCY, step=1):
+        self.minimum = minimum
+        self.maximum = maximum
+        self.slow_latency = slow_latency
+        self.step = step
+        self._size = min(maximum, max(minimum, initial))
+        self.lock = threading.Lock()
+
+    @property
+    def size(self):
+        with self.lock:
+            return self._size
+
+    def record(self, ok, latency):
+        """
+        Updates the batch size after one ask response.
+        """
+        with self.lock:
+            old_size = self._size
+            if ok and latency <= self.slow_latency:
+                self._size = min(self.maximum, self._size + self.step)
             else:
-                process = None
+                self._size = max(self.minimum, self._size // 2)
+            new_size = self._size
+        if new_size != old_size:
+            telemetry.record_batch_size(old_size, new_size)
 
-            # Die area
-            if die_area_list and "value" in die_area_list[0] and "unit" in die_area_list[0]:
-                if die_area_list[0]["unit"] == EXPECTED_DIE_AREA_UNIT:
-                    die_area = die_area_list[0]["value"]
-                else:
-                    print(f"Warning: Unexpected unit for die area: {die_area_list[0]['unit']}")
-                    die_area = None
+
+def iter_prefetched(items, maxsize=TITLE_QUEUE_SIZE):
+    """
+    Consumes the items iterator in a background thread and yields its items through
+    a bounded queue, so e.g. title paging keeps going while the consumer fetches details.
+    The producer blocks once maxsize items are waiting. Exceptions of the producer are
+    re-raised in the consumer.
+    """
+    item_queue = queue.Queue(maxsize)
+
+    def produce():
+        try:
+            for item in items:
+                item_queue.put((True, item))
+            item_queue.put((False, None))
+        except Exception as e:
+            item_queue.put((False, e))
+
+    threading.Thread(target=produce, daemon=True).start()
+    while True:
+        has_item, value = item_queue.get()
+        if not has_item:
+            if value is not None:
+                raise value
+            return
+        yield value
+
+
+def build_ask_query(batch, properties=PROCESSOR_PROPERTIES):
+    """
+    Builds an ask query for the pages in batch that requests only the configured properties.
+    """
+    query_str = " OR ".join(f"[[{t}]]" for t in batch)
+    printouts = "".join(f"|?{spec['property']}" for spec in properties if "property" in spec)
+    return f"{query_str}{printouts}"
+
+
+def fetch_ask_batch(batch, label, limiter=None, properties=PROCESSOR_PROPERTIES):
+    """
+    Runs the ask query for one batch of titles, retrying up to MAX_RETRIES times.
+
+    Args:
+        batch (list): Page titles to query
+        label (str): Batch label used in progress messages, e.g. "3/120"
+        limiter (TokenBucket): Optional rate limiter acquired before every request
+        properties (list): Property schema, see config.PROCESSOR_PROPERTIES
+
+    Returns:
+        (ask_results, cached, api_error): The ask results keyed by title, or None if the
+        batch failed, whether they came from the response cache, and the API-level error
+        (e.g. query too complex) if the API rejected the query
+    """
+    params = {
+        "action": "ask",
+        "format": "json",
+        "query": build_ask_query(batch, properties)
+    }
+
+    for attempt in range(MAX_RETRIES):
+        try:
+            resp, cached = api_get(params, limiter=limiter)
+
+            # Check for API-level errors (e.g. query too complex)
+            if "error" in resp:
+                return None, cached, resp["error"]  # Retrying the same query would fail again
+            return resp.get("query", {}).get("results", {}), cached, None
+        except Exception as e:
+            telemetry.record_retry(label, attempt + 1, e)
+            time.sleep(5)
+
+    telemetry.record_failed_batch(label, f"{MAX_RETRIES} failed attempts")
+    return None, False, None
+
+
+def fetch_ask_results(batch, label, limiter=None, sizer=None, properties=PROCESSOR_PROPERTIES):
+    """
+    Runs the ask query for one batch of titles like fetch_ask_batch. When the API rejects
+    the query, the batch is split in half and both halves are queried again, recursively,
+    until the titles that cause the error are isolated; only those are skipped.
+    Without a limiter, the sub-queries of a split are paced like sequential batches.
+
+    Args:
+        batch (list): Page titles to query
+        label (str): Batch label used in progress messages; halves get "a"/"b" appended
+        limiter (TokenBucket): Optional rate limiter acquired before every request
+        sizer (AdaptiveBatchSizer): Optional batch sizer told about the outcome of the
+            whole batch. Errors that the split isolates to single titles leave it unchanged
+        properties (list): Property schema, see config.PROCESSOR_PROPERTIES
+
+    Returns:
+        (ask_results, cached, failed_titles): The ask results of all titles that could be
+        queried (None if none could), whether all of them came from the response cache,
+        and the titles that were skipped
+    """
+    start = time.perf_counter()
+    ask_results, cached, api_error = fetch_ask_batch(batch, label, limiter=limiter, properties=properties)
+    latency = time.perf_counter() - start
+
+    if ask_results is not None or api_error is None:
+        if sizer and not cached:
+            sizer.record(ask_results is not None, latency)
+        if ask_results is not None:
+            return ask_results, cached, []
+        return None, False, list(batch)
+
+    error = f"API error {api_error.get('code')}: {api_error.get('info')}"
+    if len(batch) == 1:
+        telemetry.record_failed_batch(label, error)
+        return None, cached, list(batch)
+
+    telemetry.record_split(label, len(batch), error)
+    middle = len(batch) // 2
+    halves = []
+    for half, suffix in ((batch[:middle], "a"), (batch[middle:], "b")):
+        if limiter is None:
+            time.sleep(random.uniform(*DELAY_RANGE))
+        halves.append(fetch_ask_results(half, f"{label}{suffix}", limiter, None, properties))
+    (left_results, left_cached, left_failed), (right_results, right_cached, right_failed) = halves
+
+    # The batch was only too large if every title could be queried in the halves
+    if sizer and not cached and not left_failed and not right_failed:
+        sizer.record(False, latency)
+    if left_results is None and right_results is None:
+        return None, False, left_failed + right_failed
+    return {**(left_results or {}), **(right_results or {})}, left_cached and right_cached, left_failed + right_failed
+
+
+@lru_cache(maxsize=65536)
+def format_timestamp(timestamp):
+    return datetime.fromtimestamp(int(timestamp), tz=timezone.utc).strftime('%Y-%m-%d')
+
+
+def convert_date(values):
+    return format_timestamp(values[0]["timestamp"]) if values and "timestamp" in values[0] else ""
+
+
+def convert_quantity(values):
+    return values[0]["value"] if values and "value" in values[0] else None
+
+
+def convert_int(values):
+    return int(values[0]) if values else None
+
+
+def convert_text(values):
+    return str(values[0]) if values else None
+
+
+def convert_joined(values):
+    # Join all values (e.g. market segments) as a single string, or None if empty
+    return "; ".join(str(value) for value in values) if values else None
+
+
+# Converters referenced by name in config.PROCESSOR_PROPERTIES; each takes the list of
+# printout values of one property and returns the cell value
+PROPERTY_CONVERTERS = {
+    "date": convert_date,
+    "quantity": convert_quantity,
+    "int": convert_int,
+    "text": convert_text,
+    "joined": convert_joined
+}
+
+
+def parse_ask_results(ask_results, properties=PROCESSOR_PROPERTIES, kept_titles=None):
+    """
+    Converts ask results into processor table columns as described by the property schema,
+    dropping pages without a value for a required property. Quantities with an unexpected
+    unit are dropped with a warning. Parsed and dropped rows and unit warnings are counted
+    in the scrape telemetry. If kept_titles is a list, the title of every kept page is
+    appended to it, one per row.
+
+    Returns:
+        dict: column -> list of values, one per kept page, in the order of config.PROCESSOR_COLUMNS
+    """
+    # Required properties are checked first, so dropped pages cost as little as possible
+    specs = sorted(properties, key=lambda spec: not spec.get("required", False))
+    steps = [
+        (spec.get("field"), spec.get("property"), PROPERTY_CONVERTERS.get(spec.get("converter")),
+         spec.get("unit"), spec.get("title_fallback", False), spec.get("required", False))
+        for spec in specs
+    ]
+    columns = {spec["column"]: [] for spec in properties}
+    appends = [columns[spec["column"]].append for spec in specs]
+    kept = 0
+    unit_warnings = 0
+    for title, data in ask_results.items():
+        printouts = data.get("printouts", {})
+        values = []
+        for field, prop, converter, unit, title_fallback, required in steps:
+            if field:
+                value = data.get(field, title if title_fallback else None)
             else:
-                die_area = None
+                raw = printouts.get(prop)
+                if not raw:
+                    value = converter([])
+                elif unit is None:
+                    value = converter(raw)
+                elif "value" in raw[0] and "unit" in raw[0]:
+                    if raw[0]["unit"] == unit:
+                        value = converter(raw)
+                    else:
+                        unit_warnings += 1
+                        log_event(logging.WARNING, f"Unexpected unit for {prop}: {raw[0]['unit']}",
+                                  event="unit_warning", title=title, field=prop, unit=raw[0]["unit"])
+                        value = None
+                else:
+                    value = None
+            if required and not value:
+                break
+            values.append(value)
+        else:
+            kept += 1
+            for append, value in zip(appends, values):
+                append(value)
+            if kept_titles is not None:
+                kept_titles.append(title)
+
+    telemetry.record_rows(kept, len(ask_results) - kept, unit_warnings)
+    return columns
+
+
+def count_rows(columns):
+    return len(next(iter(columns.values()), []))
+
+
+def make_checkpoint_record(start, batch, failed_titles, columns, kept_titles):
+    """
+    Builds the checkpoint record of a finished batch of consecutive titles starting at
+    position start. Every row keeps the position of its title, so io_utils.load_checkpoint_df
+    restores the title order even when a resumed scrape fills gaps of earlier batches.
+    Skipped titles are left out so a resumed scrape tries them again.
+    """
+    positions = {title: start + offset for offset, title in enumerate(batch)}
+    return {
+        "start": start,
+        "titles": [title for title in batch if title not in failed_titles],
+        "positions": [positions.get(title, start) for title in kept_titles],
+        "columns": columns
+    }
+
 
-            if tdp and cores:
-                launch_fmt = datetime.fromtimestamp(int(launch_date), tz=timezone.utc).strftime('%Y-%m-%d') if launch_date else ""
-                display = data.get("displaytitle", title)
-                source = data.get("fullurl", None)
-                results.append((display, launch_fmt, source, market_segment, tdp, cores, threads, process, die_area))
+def concat_columns(parts, column_names=None):
+    """
+    Concatenates column dicts as returned by parse_ask_results, in the given order.
+    """
+    column_names = column_names or (list(parts[0]) if parts else [])
+    return {column: [value for part in parts for value in part.get(column, [None] * count_rows(part))] for column in column_names}
+
+
+def iter_pending_batches(titles, batch_size, checkpoint_file=None, resume=False):
+    """
+    Splits titles into batches of consecutive titles, leaving out titles already stored
+    in the checkpoint file when resuming. Without resume, an existing checkpoint file is started over.
+    titles may be any iterable; batches are yielded as soon as they are full.
+    batch_size is either a number or an AdaptiveBatchSizer, whose current size is
+    read at the start of every batch.
+
+    Yields:
+        (start, batch) pairs, where start is the position of the batch's first title in titles
+    """
+    done_titles = set()
+    if checkpoint_file and resume:
+        for record in load_jsonl_records(checkpoint_file):
+            done_titles.update(record["titles"])
+        log_event(logging.INFO, f"✅ Resuming: {len(done_titles)} titles already in {checkpoint_file}",
+                  event="resume", titles=len(done_titles), checkpoint=checkpoint_file)
+    elif checkpoint_file and os.path.exists(checkpoint_file):
+        os.remove(checkpoint_file)
+
+    start, batch = None, []
+    for idx, title in enumerate(titles):
+        if title in done_titles:
+            # Batches never span checkpointed titles, so sorting the checkpoint records
+            # by start gives the rows in title order
+            if batch:
+                yield start, batch
+                batch = []
+            continue
+        if not batch:
+            start = idx
+            limit = batch_size.size if isinstance(batch_size, AdaptiveBatchSizer) else batch_size
+        batch.append(title)
+        if len(batch) >= limit:
+            yield start, batch
+            batch = []
+    if batch:
+        yield start, batch
+
+
+def get_pending_batches(titles, batch_size, checkpoint_file=None, resume=False):
+    """
+    Returns the list of (start, batch) pairs of iter_pending_batches.
+    """
+    return list(iter_pending_batches(titles, batch_size, checkpoint_file, resume))
+
+
+def iter_labeled_batches(titles, batch_size, checkpoint_file=None, resume=False):
+    """
+    Yields (label, start, batch). Labels read "3/120" when titles is a list and just "3"
+    when titles is streamed or the batch size adapts, so the number of batches is not known yet.
+    """
+    if isinstance(titles, list) and not isinstance(batch_size, AdaptiveBatchSizer):
+        batches = get_pending_batches(titles, batch_size, checkpoint_file, resume)
+        for batch_num, (start, batch) in enumerate(batches):
+            yield f"{batch_num + 1}/{len(batches)}", start, batch
+    else:
+        for batch_num, (start, batch) in enumerate(iter_pending_batches(titles, batch_size, checkpoint_file, resume)):
+            yield f"{batch_num + 1}", start, batch
+
+
+def get_processor_data(titles, batch_size, checkpoint_file=None, resume=False, properties=PROCESSOR_PROPERTIES):
+    """
+    Fetches processor metadata from WikiChip for given titles.
 
+    Only the properties of the schema (see config.PROCESSOR_PROPERTIES) are requested.
+    If checkpoint_file is given, the columns of every finished batch are appended to it
+    instead of being kept in memory; build the table with io_utils.load_checkpoint_df.
+    titles may also be an iterator (e.g. iter_prefetched(iter_page_titles())), in which
+    case batches are fetched while later titles are still being listed.
+
+    Batches the API rejects are split in half until the failing titles are isolated
+    (see fetch_ask_results). Pass an AdaptiveBatchSizer as batch_size to also grow the
+    batches while responses are fast and clean and shrink them on errors or slow responses.
+
+    Returns:
+        dict: column -> list of values (see parse_ask_results), empty lists when the
+        columns are written to checkpoint_file
+    """
+    results = []
+    sizer = batch_size if isinstance(batch_size, AdaptiveBatchSizer) else None
+    for label, start, batch in iter_labeled_batches(titles, batch_size, checkpoint_file, resume):
+        ask_results, cached, failed_titles = fetch_ask_results(batch, label, sizer=sizer, properties=properties)
+        retries = telemetry.pop_batch_retries()
+        if ask_results is None:
+            continue
+
+        kept_titles = []
+        columns = parse_ask_results(ask_results, properties, kept_titles)
+        rows = count_rows(columns)
+        fields = {"batch": label, "rows": rows, "dropped": len(ask_results) - rows, "failed": len(failed_titles), "retries": retries}
+        if checkpoint_file:
+            append_jsonl_record(make_checkpoint_record(start, batch, failed_titles, columns, kept_titles), checkpoint_file)
+        else:
+            results.append(columns)
+
+        if cached:
+            log_event(logging.INFO, f"✅ Finished batch {label} — from cache", event="batch", cached=True, **fields)
+            continue
 
         wait = round(random.uniform(*DELAY_RANGE), 2)
-        print(f"✅ Finished batch {batch_idx // batch_size + 1}/{total_batches} — sleeping {wait}s")
+        log_event(logging.INFO, f"✅ Finished batch {label} — sleeping {wait}s", event="batch", cached=False, sleep=wait, **fields)
         time.sleep(wait)
 
-    return results
+    return concat_columns(results, [spec["column"] for spec in properties])
+
+
+def get_processor_data_concurrent(titles, batch_size, max_workers=MAX_CONCURRENCY, rate=RATE_LIMIT, burst=RATE_BURST, checkpoint_file=None, resume=False, properties=PROCESSOR_PROPERTIES):
+    """
+    Fetches processor metadata like get_processor_data, but runs up to max_workers
+    batches at once. Instead of sleeping after every batch, all workers share a
+    token bucket so the API never sees more than `rate` requests per second.
+
+    Batches are submitted as soon as they are full, with at most 2 * max_workers
+    batches waiting or in flight, so a streamed titles iterator is only consumed
+    as fast as the workers can keep up.
+
+    Returns:
+        dict: column -> list of values in the same order as get_processor_data,
+        empty lists when the columns are written to checkpoint_file
+    """
+    limiter = TokenBucket(rate, burst)
+    sizer = batch_size if isinstance(batch_size, AdaptiveBatchSizer) else None
+    checkpoint_lock = threading.Lock()
+    slots = threading.BoundedSemaphore(2 * max_workers)
+
+    def fetch(label, start, batch):
+        try:
+            ask_results, cached, failed_titles = fetch_ask_results(batch, label, limiter=limiter, sizer=sizer, properties=properties)
+            retries = telemetry.pop_batch_retries()
+            if ask_results is None:
+                return None
+            kept_titles = []
+            columns = parse_ask_results(ask_results, properties, kept_titles)
+            rows = count_rows(columns)
+            if checkpoint_file:
+                record = make_checkpoint_record(start, batch, failed_titles, columns, kept_titles)
+                with checkpoint_lock:
+                    append_jsonl_record(record, checkpoint_file)
+            log_event(logging.INFO, f"✅ Finished batch {label}", event="batch", batch=label, rows=rows, dropped=len(ask_results) - rows,
+                      failed=len(failed_titles), retries=retries, cached=cached)
+            return None if checkpoint_file else columns
+        finally:
+            slots.release()
+
+    futures = []
+    with ThreadPoolExecutor(max_workers=max_workers) as executor:
+        for label, start, batch in iter_labeled_batches(titles, batch_size, checkpoint_file, resume):
+            slots.acquire()
+            futures.append(executor.submit(fetch, label, start, batch))
 
+    # Concatenate per batch so the order does not depend on completion order;
+    # result() re-raises any unexpected worker exception
+    results = [future.result() for future in futures]
+    return concat_columns([columns for columns in results if columns is not None], [spec["column"] for spec in properties])
@@ -0,0 +1,116 @@
+import hashlib
+import json
+import os
+import threading
+import time
+from .config import CACHE_TTL, CACHE_MAX_ENTRIES
+
+
+class ResponseCache:
+    """
+    On-disk cache for parsed API responses, keyed by the request parameters.
+
+    Every entry is stored as one JSON file. Entries older than ttl seconds are
+    treated as missing, and once more than max_entries are stored the least
+    recently used ones are removed (file modification times track usage).
+
+    Args:
+        cache_dir (str): Directory holding the cache files
+        ttl (float): Time to live of an entry in seconds
+        max_entries (int): Maximum number of entries kept on disk
+    """
+
+    def __init__(self, cache_dir, ttl=CACHE_TTL, max_entries=CACHE_MAX_ENTRIES):
+        self.cache_dir = cache_dir
+        self.ttl = ttl
+        self.max_entries = max_entries
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+        self.lock = threading.Lock()
+        os.makedirs(cache_dir, exist_ok=True)
+        self.entries = len(self._entry_files())
+
+    def _entry_files(self):
+        return [name for name in os.listdir(self.cache_dir) if name.endswith(".json")]
+
+    def _path(self, params):
+        key = hashlib.sha256(json.dumps(params, sort_keys=True).encode("utf-8")).hexdigest()
+        return os.path.join(self.cache_dir, f"{key}.json")
+
+    def get(self, params):
+        """
+        Returns the cached response for params, or None if it is missing or expired.
+        """
+        path = self._path(params)
+        try:
+            with open(path, "r") as f:
+                entry = json.load(f)
+        except (OSError, json.JSONDecodeError):
+            entry = None
+
+        if entry is not None and time.time() - entry["stored_at"] > self.ttl:
+            self._remove(path)
+            entry = None
+
+        with self.lock:
+            if entry is None:
+                self.misses += 1
+                return None
+            self.hits += 1
+        # Bump the modification time so the entry counts as recently used
+        try:
+            os.utime(path)
+        except FileNotFoundError:
+            pass
+        return entry["response"]
+
+    def set(self, params, response):
+        """
+        Stores a response and evicts the least recently used entries if the cache is full.
+        """
+        path = self._path(params)
+        exists = os.path.exists(path)
+        # Write to a temporary file first so readers never see a partial entry
+        tmp_path = f"{path}.{threading.get_ident()}.tmp"
+        with open(tmp_path, "w") as f:
+            json.dump({"stored_at": time.time(), "params": params, "response": response}, f)
+        os.replace(tmp_path, path)
+
+        with self.lock:
+            if not exists:
+                self.entries += 1
+            if self.entries > self.max_entries:
+                self._evict()
+
+    def _remove(self, path):
+        try:
+            os.remove(path)
+        except FileNotFoundError:
+            return
+        with self.lock:
+            self.entries -= 1
+
+    def _evict(self):
+        # Called with the lock held
+        entries = sorted(
+            (entry.stat().st_mtime, entry.path)
+            for entry in os.scandir(self.cache_dir) if entry.name.endswith(".json")
+        )
+        for _, path in entries[:max(0, len(entries) - self.max_entries)]:
+            try:
+                os.remove(path)
+                self.evictions += 1
+            except FileNotFoundError:
+                pass
+        self.entries = len(self._entry_files())
+
+    def clear(self):
+        """
+        Removes all entries from the cache.
+        """
+        for name in self._entry_files():
+            self._remove(os.path.join(self.cache_dir, name))
+
+    def stats(self):
+        return {"hits": self.hits, "misses": self.misses, "evictions": self.evictions, "entries": self.entries}
@@ -0,0 +1,87 @@
+import pandas as pd
+from .manipulate_proc_tables import normalize_processor_column
+
+DIFF_FIELDS = ["tdp (W)", "cores", "threads", "process", "die area"]
+
+
+def index_snapshot(df, fields=DIFF_FIELDS, name_col="name"):
+    """
+    Keys a snapshot by normalized name (first row wins) and converts the compared
+    fields to numbers, so "4" and "4.0" count as the same value.
+    """
+    keyed = pd.DataFrame({field: pd.to_numeric(df[field], errors="coerce") if field in df.columns else float("nan") for field in fields})
+    keyed.index = pd.Index(normalize_processor_column(df[name_col]), name="normalized_name")
+    return keyed[~keyed.index.duplicated(keep="first")]
+
+
+def hash_rows(keyed):
+    return pd.util.hash_pandas_object(keyed, index=False)
+
+
+def diff_snapshots(old_df, new_df, fields=DIFF_FIELDS, name_col="name"):
+    """
+    Compares two snapshots of the processor table.
+
+    Rows are keyed by normalized name and hashed over the compared fields, so only
+    rows whose hash changed are compared field by field. Everything is done with
+    index operations, linear in the size of the snapshots.
+
+    Args:
+        old_df (pd.DataFrame): Older snapshot
+        new_df (pd.DataFrame): Newer snapshot
+        fields (list): Numeric fields to compare
+        name_col (str): Column name for processor names
+
+    Returns:
+        pd.DataFrame: Changelog with columns change ("added", "removed" or "changed"),
+        normalized_name, field, old, new and delta. Changed processors get one row
+        per changed field.
+    """
+    old = index_snapshot(old_df, fields, name_col)
+    new = index_snapshot(new_df, fields, name_col)
+
+    added = new.index.difference(old.index, sort=False)
+    removed = old.index.difference(new.index, sort=False)
+    common = new.index.intersection(old.index, sort=False)
+
+    old_common = old.loc[common]
+    new_common = new.loc[common]
+    changed_mask = hash_rows(old_common).to_numpy() != hash_rows(new_common).to_numpy()
+    old_changed = old_common[changed_mask]
+    new_changed = new_common[changed_mask]
+
+    parts = [
+        pd.DataFrame({"change": "added", "normalized_name": added}),
+        pd.DataFrame({"change": "removed", "normalized_name": removed})
+    ]
+    for field in fields:
+        before = old_changed[field]
+        after = new_changed[field]
+        differs = (before != after) & ~(before.isna() & after.isna())
+        parts.append(pd.DataFrame({
+            "change": "changed",
+            "normalized_name": after.index[differs],
+            "field": field,
+            "old": before[differs].to_numpy(),
+            "new": after[differs].to_numpy(),
+            # Rounded so float noise like -4.199999999999999 does not clutter the review
+            "delta": (after[differs] - before[differs]).round(6).to_numpy()
+        }))
+
+    changelog = pd.concat(parts, ignore_index=True)
+    return changelog.reindex(columns=["change", "normalized_name", "field", "old", "new", "delta"])
+
+
+def summarize_changelog(changelog):
+    """
+    Counts added, removed and changed processors, plus the number of changes per field.
+    """
+    changed = changelog[changelog["change"] == "changed"]
+    summary = {
+        "added": int((changelog["change"] == "added").sum()),
+        "removed": int((changelog["change"] == "removed").sum()),
+        "changed": int(changed["normalized_name"].nunique())
+    }
+    for field, count in changed["field"].value_counts().items():
+        summary[f"changed {field}"] = int(count)
+    return summary
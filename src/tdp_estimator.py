@@ -0,0 +1,305 @@
+import numpy as np
+import pandas as pd
+from .config import ESTIMATOR_FEATURES, ESTIMATOR_NEIGHBOURS, ESTIMATOR_LEAF_SIZE
+from .manipulate_proc_tables import DEFAULT_ROW_SEGMENT_PATTERNS, drop_default_rows, split_usage_segments
+from .tdp_lookup import get_default_row_name
+
+# Queries searched together, bounds the size of the (query, node) and (query, point) arrays
+QUERY_BLOCK_SIZE = 1024
+
+
+def to_positive_float(value):
+    # Missing, non-numeric and non-positive values are NaN, i.e. not given
+    try:
+        value = float(value)
+    except (TypeError, ValueError):
+        return np.nan
+    return value if value > 0 else np.nan
+
+
+class KDTree:
+    """
+    k-d tree over points in R^d for batched exact k-nearest-neighbour queries.
+
+    Nodes split their points at the median of the widest dimension until at most
+    leaf_size points are left, and store their bounding box. Blocks of queries are
+    searched level by level with numpy instead of one query at a time. Every query
+    first descends to its nearest leaf, whose k-th distance bounds the search.
+    Then all (query, node) pairs whose box lies within the bound are expanded
+    together, and the points of the leaves reached are compared at once.
+
+    Args:
+        points (array-like): Points as an (n, d) array
+        leaf_size (int): Maximum number of points per leaf (unless they are identical)
+    """
+
+    def __init__(self, points, leaf_size=ESTIMATOR_LEAF_SIZE):
+        points = np.asarray(points, dtype=float)
+        order = np.arange(len(points))
+        starts, ends, lefts, rights, box_mins, box_maxs, identical = [], [], [], [], [], [], []
+        # (start, end, parent, is right child)
+        stack = [(0, len(points), -1, False)] if len(points) else []
+        while stack:
+            start, end, parent, is_right = stack.pop()
+            node = len(starts)
+            if parent >= 0:
+                (rights if is_right else lefts)[parent] = node
+            idx = order[start:end]
+            box_min, box_max = points[idx].min(axis=0), points[idx].max(axis=0)
+            starts.append(start)
+            ends.append(end)
+            lefts.append(-1)
+            rights.append(-1)
+            box_mins.append(box_min)
+            box_maxs.append(box_max)
+
+            dim = int((box_max - box_min).argmax())
+            identical.append(bool(box_max[dim] == box_min[dim]))
+            if end - start <= leaf_size or identical[-1]:
+                continue
+            mid = (end - start) // 2
+            order[start:end] = idx[np.argpartition(points[idx, dim], mid)]
+            stack.append((start, start + mid, node, False))
+            stack.append((start + mid, end, node, True))
+
+        self.order = order
+        self.points = points[order]
+        self.start = np.array(starts, dtype=np.int64)
+        self.end = np.array(ends, dtype=np.int64)
+        self.left = np.array(lefts, dtype=np.int64)
+        self.right = np.array(rights, dtype=np.int64)
+        self.box_min = np.array(box_mins).reshape(len(starts), points.shape[1])
+        self.box_max = np.array(box_maxs).reshape(len(starts), points.shape[1])
+        # Leaves of identical points, e.g. processors with the same specs, only ever need k of them
+        self.identical = np.array(identical, dtype=bool)
+
+    def __len__(self):
+        return len(self.points)
+
+    def _box_dist(self, queries, nodes):
+        # Squared distance from each query to the box of its node, 0 inside the box
+        gaps = np.maximum(self.box_min[nodes] - queries, 0) + np.maximum(queries - self.box_max[nodes], 0)
+        return (gaps ** 2).sum(axis=1)
+
+    def _search(self, queries, query_ids, nodes, k):
+        """
+        Returns the k smallest squared distances and point positions per query among
+        the points of the given (query, leaf) pairs, padded with inf and -1.
+        """
+        counts = self.end[nodes] - self.start[nodes]
+        counts = np.where(self.identical[nodes], np.minimum(counts, k), counts)
+        query_rep = np.repeat(query_ids, counts)
+        offsets = np.arange(counts.sum()) - np.repeat(np.cumsum(counts) - counts, counts)
+        point_ids = np.repeat(self.start[nodes], counts) + offsets
+        dist = ((self.points[point_ids] - queries[query_rep]) ** 2).sum(axis=1)
+
+        # Sort by query, then distance, and keep the first k of every query
+        by_query = np.lexsort((dist, query_rep))
+        query_sorted = query_rep[by_query]
+        rank = np.arange(len(by_query)) - np.searchsorted(query_sorted, query_sorted, side="left")
+        keep = rank < k
+        out_dist = np.full((len(queries), k), np.inf)
+        out_ids = np.full((len(queries), k), -1, dtype=np.int64)
+        out_dist[query_sorted[keep], rank[keep]] = dist[by_query][keep]
+        out_ids[query_sorted[keep], rank[keep]] = point_ids[by_query][keep]
+        return out_dist, out_ids
+
+    def query(self, queries, k=ESTIMATOR_NEIGHBOURS):
+        """
+        Finds the k nearest points of every query.
+
+        Returns:
+            tuple: (distances, indices), both (n_queries, k) arrays sorted by distance.
+            Indices refer to the points passed to the constructor. If the tree has
+            fewer than k points, the missing neighbours have distance inf and index -1.
+        """
+        queries = np.asarray(queries, dtype=float)
+        distances = np.full((len(queries), k), np.inf)
+        indices = np.full((len(queries), k), -1, dtype=np.int64)
+        if not len(self.points):
+            return distances, indices
+
+        for block in range(0, len(queries), QUERY_BLOCK_SIZE):
+            q = queries[block:block + QUERY_BLOCK_SIZE]
+            all_ids = np.arange(len(q))
+
+            # Descend to the nearest leaf, its k-th distance bounds the search
+            # (a leaf with fewer than k points leaves the bound at inf)
+            nodes = np.zeros(len(q), dtype=np.int64)
+            internal = self.left[nodes] >= 0
+            while internal.any():
+                ids = np.nonzero(internal)[0]
+                left, right = self.left[nodes[ids]], self.right[nodes[ids]]
+                nodes[ids] = np.where(self._box_dist(q[ids], right) < self._box_dist(q[ids], left), right, left)
+                internal = self.left[nodes] >= 0
+            bound = self._search(q, all_ids, nodes, k)[0][:, -1]
+
+            # Expand all (query, node) pairs within the bound, one level per step
+            query_ids, nodes = all_ids, np.zeros(len(q), dtype=np.int64)
+            leaf_query_ids, leaf_nodes = [], []
+            while len(nodes):
+                near = self._box_dist(q[query_ids], nodes) <= bound[query_ids]
+                query_ids, nodes = query_ids[near], nodes[near]
+                is_leaf = self.left[nodes] < 0
+                leaf_query_ids.append(query_ids[is_leaf])
+                leaf_nodes.append(nodes[is_leaf])
+                query_ids, nodes = query_ids[~is_leaf], nodes[~is_leaf]
+                query_ids = np.concatenate([query_ids, query_ids])
+                nodes = np.concatenate([self.left[nodes], self.right[nodes]])
+
+            dist, ids = self._search(q, np.concatenate(leaf_query_ids), np.concatenate(leaf_nodes), k)
+            distances[block:block + len(q)] = np.sqrt(dist)
+            indices[block:block + len(q)] = np.where(ids >= 0, self.order[np.maximum(ids, 0)], -1)
+        return distances, indices
+
+
+class TDPEstimator:
+    """
+    Estimates the TDP of processors that are not in the table from the processors
+    with the most similar specs (ESTIMATOR_FEATURES: cores, threads, process, die area).
+
+    Features are compared as log2 values scaled by their spread over the table, so
+    doubling the cores counts the same at 2 and at 64 cores. The table is partitioned
+    like the default rows ("compute cluster", "local", "cloud", "embedded", plus
+    "default" with every processor), and a query only searches the partition of its
+    usage. Each combination of partition and given features gets its own KDTree,
+    built on first use over the processors that have all of those features (see
+    choose_tree for the fallbacks when there are none).
+
+    The estimate is the inverse-distance weighted geometric mean of the neighbours'
+    TDP. Its confidence (0-1) is the share of features used, times 1 / (1 + mean
+    neighbour distance), divided by 1 + the weighted spread of the neighbours' TDP
+    in doublings.
+
+    Args:
+        df (pd.DataFrame): Table produced by scrape_processors (default rows are ignored)
+        k (int): Number of neighbours per estimate
+        leaf_size (int): Maximum number of points per KDTree leaf
+    """
+
+    def __init__(self, df, k=ESTIMATOR_NEIGHBOURS, leaf_size=ESTIMATOR_LEAF_SIZE):
+        self.k = k
+        self.leaf_size = leaf_size
+        df = drop_default_rows(df)
+        tdp = pd.to_numeric(df["tdp (W)"], errors="coerce")
+        cores = pd.to_numeric(df["cores"], errors="coerce")
+        self.rows = df[(tdp > 0) & (cores > 0)].reset_index(drop=True)
+
+        features = np.column_stack([
+            pd.to_numeric(self.rows[col], errors="coerce").to_numpy(dtype=float) if col in self.rows.columns else np.full(len(self.rows), np.nan)
+            for col in ESTIMATOR_FEATURES
+        ]).reshape(len(self.rows), len(ESTIMATOR_FEATURES))
+        with np.errstate(divide="ignore", invalid="ignore"):
+            features = np.log2(np.where(features > 0, features, np.nan))
+        scale = np.nanstd(features, axis=0) if len(self.rows) else np.ones(len(ESTIMATOR_FEATURES))
+        self.scale = np.where(np.isfinite(scale) & (scale > 0), scale, 1.0)
+        self.features = features / self.scale
+        self.log_tdp = np.log2(pd.to_numeric(self.rows["tdp (W)"]).to_numpy(dtype=float))
+
+        self.partitions = {"default": np.arange(len(self.rows))}
+        segments = split_usage_segments(self.rows["intended usage"]) if "intended usage" in self.rows.columns else pd.Series(dtype=object)
+        unique_segments = pd.Series(segments.unique(), dtype=object)
+        for name, pattern in DEFAULT_ROW_SEGMENT_PATTERNS.items():
+            matched = set(unique_segments[unique_segments.str.contains(pattern, regex=True)])
+            self.partitions[name] = np.unique(segments.index[segments.isin(matched)].to_numpy(dtype=np.int64))
+        self.trees = {}
+        # Neighbours are reported as these rows
+        records = self.rows.reindex(columns=["name", "tdp (W)", *ESTIMATOR_FEATURES])
+        self.records = records.astype(object).where(records.notna(), None).to_dict("records")
+
+    @classmethod
+    def from_csv(cls, filename, k=ESTIMATOR_NEIGHBOURS):
+        """
+        Loads the table from a CSV file or Parquet snapshot. Returns None if the file is missing.
+        """
+        from .io_utils import load_table_from_file
+        df = load_table_from_file(filename)
+        if df is None:
+            return None
+        return cls(df, k=k)
+
+    def get_tree(self, partition, feature_mask):
+        """
+        Returns the KDTree over the processors of a partition that have all features
+        of feature_mask, and their row positions, building it on first use.
+        """
+        key = (partition, tuple(feature_mask))
+        if key not in self.trees:
+            positions = self.partitions[partition]
+            positions = positions[~np.isnan(self.features[positions][:, feature_mask]).any(axis=1)]
+            self.trees[key] = (KDTree(self.features[positions][:, feature_mask], self.leaf_size), positions)
+        return self.trees[key]
+
+    def choose_tree(self, usage, feature_mask):
+        """
+        Picks the tree for a query: the partition of its usage, else all processors,
+        else all processors compared on cores only (if no processor has all given features).
+
+        Returns:
+            tuple: (partition, feature mask, KDTree, row positions)
+        """
+        cores_only = np.arange(len(ESTIMATOR_FEATURES)) == 0
+        candidates = [(get_default_row_name(usage), feature_mask), ("default", feature_mask), ("default", cores_only)]
+        for partition, mask in candidates:
+            if partition in self.partitions:
+                tree, positions = self.get_tree(partition, mask)
+                if len(tree):
+                    return partition, mask, tree, positions
+        return partition, mask, tree, positions
+
+    def estimate_many(self, specs, usage=None, k=None):
+        """
+        Estimates the TDP of a batch of processors that share the same usage category.
+        Queries with the same features given are answered together with one tree search.
+
+        Args:
+            specs (list): Dicts with "cores" and optionally "threads", "process" (nm) and "die area" (mm²)
+            usage (str): Optional usage category ("local", "compute cluster", "cloud" or "embedded")
+            k (int): Number of neighbours (default: the estimator's k)
+
+        Returns:
+            list: One result per spec, in the same order: a dict with the estimated "tdp (W)",
+            its "confidence", the searched "partition" and the "neighbours" used (table rows
+            plus their "distance"), or None if the spec has no valid core count
+        """
+        k = k or self.k
+        values = np.array([[to_positive_float(spec.get(col)) for col in ESTIMATOR_FEATURES] for spec in specs], dtype=float)
+        queries = np.log2(values.reshape(len(specs), len(ESTIMATOR_FEATURES))) / self.scale
+
+        results = [None] * len(specs)
+        given = ~np.isnan(queries)
+        for given_mask in np.unique(given[given[:, 0]], axis=0):
+            ids = np.nonzero((given == given_mask).all(axis=1))[0]
+            partition, feature_mask, tree, positions = self.choose_tree(usage, given_mask)
+            distances, neighbour_ids = tree.query(queries[ids][:, feature_mask], k)
+            found = neighbour_ids >= 0
+            neighbour_ids = positions[np.maximum(neighbour_ids, 0)]
+
+            # Inverse-distance weighted mean and spread of the neighbours' log2 TDP
+            weights = np.where(found, 1 / (np.where(found, distances, 0) + 0.05), 0)
+            log_tdp = self.log_tdp[neighbour_ids]
+            with np.errstate(divide="ignore", invalid="ignore"):
+                mean = (weights * log_tdp).sum(axis=1) / weights.sum(axis=1)
+                spread = np.sqrt((weights * (log_tdp - mean[:, None]) ** 2).sum(axis=1) / weights.sum(axis=1))
+                mean_distance = np.where(found, distances, 0).sum(axis=1) / found.sum(axis=1)
+            confidence = feature_mask.sum() / len(ESTIMATOR_FEATURES) / (1 + mean_distance) / (1 + spread)
+
+            for row, i in enumerate(ids):
+                if not found[row].any():
+                    continue
+                results[i] = {
+                    "tdp (W)": round(float(2 ** mean[row]), 2),
+                    "confidence": round(float(confidence[row]), 3),
+                    "partition": partition,
+                    "neighbours": [
+                        {**self.records[position], "distance": round(float(distance), 4)}
+                        for position, distance in zip(neighbour_ids[row][found[row]], distances[row][found[row]])
+                    ]
+                }
+        return results
+
+    def estimate(self, spec, usage=None, k=None):
+        """
+        Estimates the TDP of one processor, see estimate_many.
+        """
+        return self.estimate_many([spec], usage, k)[0]
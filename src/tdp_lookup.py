@@ -0,0 +1,95 @@
+from functools import lru_cache
+from .config import LOOKUP_CACHE_SIZE
+from .name_normalization import normalize_processor_name
+
+# Usage categories of the consumers -> default row added by add_default_rows
+USAGE_DEFAULT_ROWS = {
+    "compute cluster": "default compute cluster",
+    "local": "default local",
+    "cloud": "default cloud",
+    "embedded": "default embedded"
+}
+
+
+def get_default_row_name(usage=None):
+    """
+    Returns the name of the default row to fall back to for a usage category,
+    or the general "default" row for unknown or missing categories.
+    """
+    if not isinstance(usage, str):
+        return "default"
+    return USAGE_DEFAULT_ROWS.get(usage.strip().lower(), "default")
+
+
+class TDPLookup:
+    """
+    In-memory CPU model -> TDP lookup over a table produced by scrape_processors
+    (i.e. including the rows from add_default_rows).
+
+    Names are normalized with normalize_processor_name and kept in a hash index.
+    Processors that are not in the table fall back to the default row of their
+    usage category. Results are cached in an LRU, so repeated queries for the
+    same model (one per task of a pipeline) skip normalization entirely.
+
+    Args:
+        rows (list): Table rows as dicts with at least "name", "tdp (W)" and "cores"
+        cache_size (int): Maximum number of cached lookup results
+    """
+
+    def __init__(self, rows, cache_size=LOOKUP_CACHE_SIZE):
+        self.index = {}
+        for row in rows:
+            # Keep the first row per name, like drop_duplicate_names
+            self.index.setdefault(normalize_processor_name(row["name"]), row)
+        self._lookup = lru_cache(maxsize=cache_size)(self._lookup_uncached)
+
+    @classmethod
+    def from_csv(cls, filename, cache_size=LOOKUP_CACHE_SIZE):
+        """
+        Loads the table from a CSV file once and builds the index. Returns None if the file is missing.
+        """
+        # pandas is only needed here, keep it out of the import of this module
+        from .io_utils import load_csv_from_file
+        df = load_csv_from_file(filename)
+        if df is None:
+            return None
+        df = df.astype(object).where(df.notna(), None)
+        return cls(df.to_dict("records"), cache_size=cache_size)
+
+    def _lookup_uncached(self, name, usage):
+        row = self.index.get(normalize_processor_name(name))
+        if row is not None:
+            return {**row, "match": "exact"}
+        default_row = self.index.get(get_default_row_name(usage)) or self.index.get("default")
+        if default_row is not None:
+            return {**default_row, "match": "default"}
+        return None
+
+    def lookup(self, name, usage=None):
+        """
+        Looks up one processor.
+
+        Args:
+            name (str): Processor name as reported by the consumer, e.g. "Intel® Xeon® Gold 6148"
+            usage (str): Optional usage category ("local", "compute cluster", "cloud" or "embedded")
+                used to pick the default row when the name is unknown
+
+        Returns:
+            dict: The table row plus "match" ("exact" or "default"), or None if the
+            table has neither the processor nor any default row
+        """
+        result = self._lookup(name, usage)
+        # Copy so callers cannot change the cached result
+        return dict(result) if result is not None else None
+
+    def lookup_many(self, names, usage=None):
+        """
+        Looks up a batch of processors that share the same usage category.
+
+        Returns:
+            list: One result (see lookup) per name, in the same order
+        """
+        return [self.lookup(name, usage) for name in names]
+
+    def cache_info(self):
+        return self._lookup.cache_info()
@@ -0,0 +1,241 @@
+import json
+import logging
+import os
+import threading
+import time
+from contextlib import contextmanager
+from datetime import datetime, timezone
+
+logger = logging.getLogger("wikichip")
+
+PROMETHEUS_PREFIX = "wikichip_scrape"
+
+
+class JsonFormatter(logging.Formatter):
+    """
+    Formats every log record as one JSON object per line, with the structured
+    fields passed through extra={"fields": {...}} merged in.
+    """
+
+    def format(self, record):
+        event = {
+            "time": datetime.fromtimestamp(record.created, tz=timezone.utc).isoformat(),
+            "level": record.levelname.lower(),
+            "message": record.getMessage()
+        }
+        event.update(getattr(record, "fields", {}))
+        return json.dumps(event, default=str)
+
+
+def configure_logging(log_format="text", level=logging.INFO):
+    """
+    Sends the scraper's log records to stderr, either as plain messages ("text")
+    or as JSON lines ("json").
+    """
+    handler = logging.StreamHandler()
+    handler.setFormatter(JsonFormatter() if log_format == "json" else logging.Formatter("%(message)s"))
+    logger.handlers[:] = [handler]
+    logger.setLevel(level)
+    logger.propagate = False
+
+
+def log_event(level, message, **fields):
+    logger.log(level, message, extra={"fields": fields})
+
+
+def get_request_kind(params):
+    """
+    Names an API request after what it asks for: "ask", "categorymembers", "info", ...
+    """
+    if params.get("action") == "ask":
+        return "ask"
+    return params.get("list") or params.get("prop") or params.get("action", "unknown")
+
+
+def percentile(sorted_values, q):
+    if not sorted_values:
+        return None
+    return round(sorted_values[min(len(sorted_values) - 1, int(q * len(sorted_values)))], 4)
+
+
+class ScrapeTelemetry:
+    """
+    Thread-safe counters for one scrape: API requests (latency, bytes, cache hits,
+    errors), retries, parsed and dropped rows, unit warnings and stage durations.
+    """
+
+    def __init__(self):
+        self.lock = threading.Lock()
+        # Retries of the batch the current thread is working on, see pop_batch_retries
+        self.local = threading.local()
+        self.reset()
+
+    def reset(self):
+        with self.lock:
+            self.requests = {}
+            self.counters = {"retries": 0, "split_batches": 0, "failed_batches": 0, "rows_parsed": 0, "rows_dropped": 0, "unit_warnings": 0}
+            self.stages = {}
+            self.cache = None
+
+    def record_request(self, kind, latency, response_bytes, status=None, cached=False, error=False):
+        with self.lock:
+            stats = self.requests.setdefault(kind, {"requests": 0, "cached": 0, "errors": 0, "bytes": 0, "latencies": []})
+            stats["requests"] += 1
+            if cached:
+                stats["cached"] += 1
+            else:
+                stats["latencies"].append(latency)
+                stats["bytes"] += response_bytes
+            if error:
+                stats["errors"] += 1
+        log_event(logging.DEBUG, f"{kind} request", event="request", kind=kind, latency=round(latency, 4),
+                  bytes=response_bytes, status=status, cached=cached, error=error)
+
+    def record_retry(self, label, attempt, error):
+        with self.lock:
+            self.counters["retries"] += 1
+        self.local.retries = getattr(self.local, "retries", 0) + 1
+        log_event(logging.WARNING, f"Attempt {attempt} failed for batch {label}: {error}",
+                  event="retry", batch=label, attempt=attempt, error=str(error))
+
+    def pop_batch_retries(self):
+        """
+        Returns the number of retries recorded by the current thread since the last call.
+        """
+        retries = getattr(self.local, "retries", 0)
+        self.local.retries = 0
+        return retries
+
+    def record_split(self, label, size, error):
+        with self.lock:
+            self.counters["split_batches"] += 1
+        log_event(logging.WARNING, f"Splitting batch {label} of {size} titles after API error: {error}",
+                  event="batch_split", batch=label, size=size, error=error)
+
+    def record_batch_size(self, old_size, new_size):
+        log_event(logging.DEBUG, f"Batch size {old_size} -> {new_size}", event="batch_size", old=old_size, new=new_size)
+
+    def record_failed_batch(self, label, reason):
+        with self.lock:
+            self.counters["failed_batches"] += 1
+        log_event(logging.ERROR, f"Skipping batch {label}: {reason}", event="batch_failed", batch=label, reason=reason)
+
+    def record_rows(self, parsed, dropped, unit_warnings):
+        with self.lock:
+            self.counters["rows_parsed"] += parsed
+            self.counters["rows_dropped"] += dropped
+            self.counters["unit_warnings"] += unit_warnings
+
+    def record_cache(self, stats):
+        with self.lock:
+            self.cache = dict(stats)
+
+    @contextmanager
+    def stage(self, name):
+        """
+        Times a block of the scrape; repeated stages with the same name add up.
+        """
+        log_event(logging.INFO, f"{name}...", event="stage_start", stage=name)
+        start = time.perf_counter()
+        try:
+            yield
+        finally:
+            seconds = time.perf_counter() - start
+            with self.lock:
+                self.stages[name] = self.stages.get(name, 0.0) + seconds
+            log_event(logging.INFO, f"{name} took {seconds:.2f}s", event="stage_end", stage=name, seconds=round(seconds, 4))
+
+    def summary(self):
+        with self.lock:
+            requests = {}
+            for kind, stats in self.requests.items():
+                latencies = sorted(stats["latencies"])
+                requests[kind] = {
+                    "requests": stats["requests"],
+                    "cached": stats["cached"],
+                    "errors": stats["errors"],
+                    "bytes": stats["bytes"],
+                    "latency_seconds": {
+                        "sum": round(sum(latencies), 4),
+                        "mean": round(sum(latencies) / len(latencies), 4) if latencies else None,
+                        "p50": percentile(latencies, 0.5),
+                        "p95": percentile(latencies, 0.95),
+                        "max": round(latencies[-1], 4) if latencies else None
+                    }
+                }
+            summary = {
+                "requests": requests,
+                **self.counters,
+                "stages_seconds": {name: round(seconds, 4) for name, seconds in self.stages.items()}
+            }
+            if self.cache is not None:
+                summary["cache"] = self.cache
+            return summary
+
+    def log_summary(self):
+        summary = self.summary()
+        total = sum(stats["requests"] for stats in summary["requests"].values())
+        cached = sum(stats["cached"] for stats in summary["requests"].values())
+        log_event(logging.INFO,
+                  f"✅ {total} API requests ({cached} cached, {summary['retries']} retries, {summary['split_batches']} splits, {summary['failed_batches']} failed batches), "
+                  f"{summary['rows_parsed']} rows parsed, {summary['rows_dropped']} dropped, {summary['unit_warnings']} unit warnings",
+                  event="summary", summary=summary)
+        return summary
+
+    def write_json(self, filename):
+        write_atomic(filename, json.dumps(self.summary(), indent=2) + "\n")
+
+    def write_prometheus(self, filename):
+        """
+        Writes the summary in the Prometheus text format, e.g. for the node_exporter textfile collector.
+        """
+        summary = self.summary()
+        lines = []
+
+        def metric(name, metric_type, help_text, samples):
+            lines.append(f"# HELP {PROMETHEUS_PREFIX}_{name} {help_text}")
+            lines.append(f"# TYPE {PROMETHEUS_PREFIX}_{name} {metric_type}")
+            for labels, value in samples:
+                label_str = ",".join(f'{key}="{val}"' for key, val in labels.items())
+                lines.append(f"{PROMETHEUS_PREFIX}_{name}{{{label_str}}} {value}" if label_str else f"{PROMETHEUS_PREFIX}_{name} {value}")
+
+        requests = summary["requests"]
+        metric("requests_total", "counter", "API requests by kind and cache status.", [
+            sample for kind, stats in requests.items() for sample in (
+                ({"kind": kind, "cached": "false"}, stats["requests"] - stats["cached"]),
+                ({"kind": kind, "cached": "true"}, stats["cached"])
+            )
+        ])
+        metric("request_errors_total", "counter", "API requests that failed or returned an API error.",
+               [({"kind": kind}, stats["errors"]) for kind, stats in requests.items()])
+        metric("response_bytes_total", "counter", "Bytes received from the API.",
+               [({"kind": kind}, stats["bytes"]) for kind, stats in requests.items()])
+        metric("request_latency_seconds_sum", "counter", "Total latency of uncached API requests.",
+               [({"kind": kind}, stats["latency_seconds"]["sum"]) for kind, stats in requests.items()])
+        for counter, help_text in (
+            ("retries", "Retried ask batches."),
+            ("split_batches", "Ask batches split in half after an API error."),
+            ("failed_batches", "Ask batches skipped after errors."),
+            ("rows_parsed", "Processor rows parsed from ask results."),
+            ("rows_dropped", "Ask results dropped for missing TDP or core count."),
+            ("unit_warnings", "Values dropped because of an unexpected unit.")
+        ):
+            metric(f"{counter}_total", "counter", help_text, [({}, summary[counter])])
+        metric("stage_seconds", "gauge", "Duration of each scrape stage.",
+               [({"stage": stage}, seconds) for stage, seconds in summary["stages_seconds"].items()])
+        write_atomic(filename, "\n".join(lines) + "\n")
+
+
+def write_atomic(filename, text):
+    # Readers such as the textfile collector never see a half-written file
+    directory = os.path.dirname(filename)
+    if directory:
+        os.makedirs(directory, exist_ok=True)
+    tmp_path = f"{filename}.tmp"
+    with open(tmp_path, "w", encoding="utf-8") as f:
+        f.write(text)
+    os.replace(tmp_path, filename)
+
+
+# Shared by the scraper modules, reset at the start of every scrape
+telemetry = ScrapeTelemetry()